@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+UTILITÁRIOS COMUNS - PIPELINES BCB
+================================================================================
+Repositório : https://github.com/mazoir/dados_publicos
+
+Descrição:
+    Funções compartilhadas por pipeline_estban.py e pipeline_cooperados.py.
+    Deve ficar na mesma pasta dos pipelines (é importado diretamente).
+
+Conteúdo:
+    HTTP    - fábrica de sessões com pool de conexões e retry com backoff;
+              limitador de taxa (token bucket) para downloads concorrentes
+    PARQUET - gravação tipada e comprimida (opcional, requer pyarrow)
+    GZIP    - escritor gzip com compressão em blocos paralelos (estilo pigz)
+    CNPJ    - normalização de CNPJ por valor distinto, com cache entre meses
+    MEDIÇÃO - etapas cronometradas (tempo, bytes, linhas, RSS),
+              relatório JSON da execução e textfile do Prometheus
+================================================================================
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import threading
+import contextlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet é opcional: pip install pyarrow
+    pa = pq = None
+
+try:
+    import resource
+except ImportError:  # Windows: sem pico de RSS nas medições
+    resource = None
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+
+# Retry automático do urllib3, só para falhas ao abrir a conexão. Respostas
+# HTTP de erro (5xx) e timeouts de leitura ficam com o laço de tentativas de
+# cada pipeline, para não multiplicar as tentativas por URL.
+HTTP_RETRY_TOTAL = 2
+HTTP_RETRY_BACKOFF = 1
+
+# Conexões mantidas por host (keep-alive)
+HTTP_POOL_MINIMO = 4
+
+# Compressão das colunas Parquet
+PARQUET_COMPRESSAO = "zstd"
+
+# Gzip paralelo: nível padrão e tamanho do bloco comprimido por thread
+GZIP_NIVEL_DEFAULT = 6
+GZIP_BLOCO = 1024 * 1024
+GZIP_JANELA = 32 * 1024  # dicionário herdado do bloco anterior
+
+# CNPJ: dígitos da raiz (zeros à esquerda)
+CNPJ_DIGITOS = 8
+
+
+# ==============================================================================
+# SESSÃO HTTP
+# ==============================================================================
+
+def criar_sessao(
+    pool_size: int = HTTP_POOL_MINIMO,
+    headers: Optional[dict] = None,
+    retries: int = HTTP_RETRY_TOTAL,
+) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões e retry de conexão com backoff.
+
+    A mesma sessão deve ser reutilizada em todos os downloads de uma execução,
+    para que o handshake TCP+TLS seja feito uma única vez por conexão do pool.
+
+    Args:
+        pool_size: Número de downloads simultâneos que usarão a sessão
+                   (dimensiona o pool de conexões por host)
+        headers: Headers padrão aplicados a todas as requisições
+        retries: Novas tentativas de conexão feitas pelo urllib3; use 0 quando
+                 cada requisição precisa passar por um LimitadorTaxa
+
+    Returns:
+        requests.Session configurada
+    """
+    tamanho = max(pool_size, HTTP_POOL_MINIMO)
+
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+
+    adapter = HTTPAdapter(
+        pool_connections=tamanho,
+        pool_maxsize=tamanho,
+        max_retries=Retry(
+            total=retries,
+            read=0,
+            backoff_factor=HTTP_RETRY_BACKOFF,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class LimitadorTaxa:
+    """
+    Limitador de requisições por segundo (token bucket), seguro entre threads.
+
+    Cada requisição consome uma ficha; as fichas são repostas à taxa
+    configurada até o limite `rajada`. Sem ficha disponível, aguardar()
+    reserva a próxima e dorme fora do lock, então várias threads saem
+    espaçadas de 1/taxa segundos, na ordem em que chegaram.
+
+    Uso:
+        limitador = LimitadorTaxa(2.0)   # até 2 requisições/s
+        limitador.aguardar()
+        session.get(url)
+    """
+
+    def __init__(self, taxa: float, rajada: int = 1):
+        self.taxa = taxa
+        self.rajada = max(rajada, 1)
+        self._fichas = float(self.rajada)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def aguardar(self) -> None:
+        """Bloqueia até haver ficha para mais uma requisição (taxa <= 0: sem limite)."""
+        if self.taxa <= 0:
+            return
+        with self._lock:
+            agora = time.monotonic()
+            self._fichas = min(self.rajada, self._fichas + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            self._fichas -= 1
+            espera = -self._fichas / self.taxa if self._fichas < 0 else 0
+        if espera:
+            time.sleep(espera)
+
+
+# ==============================================================================
+# PARQUET
+# ==============================================================================
+
+def parquet_disponivel() -> bool:
+    """Indica se o pyarrow está instalado (gravação Parquet habilitada)."""
+    return pq is not None
+
+
+def tabela_arrow(
+    df: pd.DataFrame,
+    texto: tuple = (),
+    datas: tuple = (),
+    inteiros: tuple = (),
+):
+    """
+    Converte o DataFrame em tabela Arrow com tipos explícitos.
+
+    Args:
+        df: DataFrame a converter
+        texto: Colunas de código (CNPJ, CODMUN) → string com dicionário
+        datas: Colunas de data (datetime ou texto YYYY-MM-DD) → date32
+        inteiros: Colunas inteiras → int32
+
+    Demais colunas numéricas viram float64 e as restantes, string.
+    """
+    colunas = {}
+    for col in df.columns:
+        serie = df[col]
+        if col in datas:
+            if not pd.api.types.is_datetime64_any_dtype(serie):
+                serie = pd.to_datetime(serie, format="%Y-%m-%d")
+            colunas[col] = pa.array(serie).cast(pa.date32())
+        elif col in texto:
+            colunas[col] = pa.array(serie.astype(str), type=pa.string()).dictionary_encode()
+        elif col in inteiros:
+            colunas[col] = pa.array(serie, type=pa.int32())
+        elif pd.api.types.is_numeric_dtype(serie):
+            colunas[col] = pa.array(serie, type=pa.float64())
+        else:
+            colunas[col] = pa.array(serie.astype(str), type=pa.string())
+    return pa.table(colunas)
+
+
+def salvar_parquet(
+    df: pd.DataFrame,
+    caminho: Path,
+    texto: tuple = (),
+    datas: tuple = (),
+    inteiros: tuple = (),
+) -> bool:
+    """
+    Grava o DataFrame em Parquet tipado e comprimido (ver tabela_arrow).
+
+    Returns:
+        True se gravou; False se o pyarrow não estiver instalado
+    """
+    if not parquet_disponivel():
+        return False
+
+    tabela = tabela_arrow(df, texto=texto, datas=datas, inteiros=inteiros)
+    pq.write_table(tabela, caminho, compression=PARQUET_COMPRESSAO)
+    return True
+
+
+class ParquetEmPartes:
+    """
+    Grava um arquivo Parquet em partes: cada write() vira um row group.
+
+    Permite gravar o consolidado mês a mês sem mantê-lo inteiro em memória.
+    Os tipos seguem tabela_arrow (mesmos argumentos em todas as partes).
+    """
+
+    def __init__(self, caminho: Path, texto: tuple = (), datas: tuple = (), inteiros: tuple = ()):
+        self.caminho = caminho
+        self._tipos = {"texto": texto, "datas": datas, "inteiros": inteiros}
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        tabela = tabela_arrow(df, **self._tipos)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.caminho, tabela.schema, compression=PARQUET_COMPRESSAO)
+        self._writer.write_table(tabela)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+# ==============================================================================
+# GZIP PARALELO
+# ==============================================================================
+
+class GzipParalelo:
+    """
+    Escritor de arquivo .gz com compressão em blocos paralelos (estilo pigz).
+
+    Os dados são divididos em blocos de GZIP_BLOCO bytes, comprimidos em
+    threads (o zlib libera o GIL) com os últimos 32 KB do bloco anterior
+    como dicionário, e encadeados em um único membro gzip padrão: qualquer
+    leitor gzip (pandas, gzip, Power BI) o lê normalmente.
+
+    Se o bloco `with` terminar com exceção, o rodapé não é gravado e o
+    arquivo incompleto é removido (descartar()): um .gz truncado nunca
+    passa por válido.
+
+    Uso:
+        with GzipParalelo(caminho, nivel=6, threads=4) as gz:
+            gz.write(dados)
+    """
+
+    def __init__(self, caminho: Path, nivel: int = GZIP_NIVEL_DEFAULT, threads: Optional[int] = None):
+        self.nivel = nivel
+        self.threads = max(threads or os.cpu_count() or 1, 1)
+        self.caminho = Path(caminho)
+        self._arquivo = open(self.caminho, "wb")
+        self._buffer = bytearray()
+        self._anterior = b""
+        self._crc = 0
+        self._tamanho = 0
+        self._pendentes = deque()
+        self._executor = ThreadPoolExecutor(self.threads) if self.threads > 1 else None
+
+        # Cabeçalho gzip (RFC 1952): sem nome de arquivo, SO desconhecido
+        self._arquivo.write(struct.pack("<BBBBIBB", 0x1F, 0x8B, 8, 0, int(time.time()), 0, 255))
+
+    def write(self, dados: bytes) -> int:
+        """Acrescenta dados ao arquivo; comprime a cada bloco completo."""
+        self._crc = zlib.crc32(dados, self._crc)
+        self._tamanho += len(dados)
+        self._buffer += dados
+        while len(self._buffer) >= GZIP_BLOCO:
+            self._enviar(bytes(self._buffer[:GZIP_BLOCO]))
+            del self._buffer[:GZIP_BLOCO]
+        return len(dados)
+
+    def close(self) -> None:
+        """Comprime o restante, fecha o fluxo deflate e grava o rodapé."""
+        if self._arquivo.closed:
+            return
+        try:
+            if self._buffer:
+                self._enviar(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pendentes:
+                self._gravar_proximo()
+
+            # Bloco final vazio (BFINAL=1) encerra o fluxo deflate
+            self._arquivo.write(zlib.compressobj(self.nivel, zlib.DEFLATED, -15).flush(zlib.Z_FINISH))
+            self._arquivo.write(struct.pack("<II", self._crc & 0xFFFFFFFF, self._tamanho & 0xFFFFFFFF))
+        except BaseException:
+            self.descartar()
+            raise
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._arquivo.close()
+
+    def descartar(self) -> None:
+        """Interrompe sem gravar o rodapé e remove o arquivo incompleto."""
+        if self._arquivo.closed:
+            return
+        self._pendentes.clear()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+        self._arquivo.close()
+        self.caminho.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastreio):
+        if tipo is None:
+            self.close()
+        else:
+            self.descartar()
+
+    def _enviar(self, bloco: bytes) -> None:
+        """Agenda a compressão de um bloco, limitando os blocos em memória."""
+        dicionario = self._anterior[-GZIP_JANELA:]
+        self._anterior = bloco
+        if self._executor is None:
+            self._arquivo.write(_comprimir_bloco(bloco, dicionario, self.nivel))
+            return
+        self._pendentes.append(self._executor.submit(_comprimir_bloco, bloco, dicionario, self.nivel))
+        while len(self._pendentes) > self.threads * 2:
+            self._gravar_proximo()
+
+    def _gravar_proximo(self) -> None:
+        self._arquivo.write(self._pendentes.popleft().result())
+
+
+def _comprimir_bloco(bloco: bytes, dicionario: bytes, nivel: int) -> bytes:
+    """Comprime um bloco em deflate bruto, terminando em fronteira de byte (Z_SYNC_FLUSH)."""
+    if dicionario:
+        compressor = zlib.compressobj(nivel, zlib.DEFLATED, -15, zdict=dicionario)
+    else:
+        compressor = zlib.compressobj(nivel, zlib.DEFLATED, -15)
+    return compressor.compress(bloco) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+# ==============================================================================
+# CNPJ
+# ==============================================================================
+
+# Cache valor bruto → valor normalizado, por modo (raiz truncada ou não);
+# vale para todo o processo, então meses seguintes só normalizam CNPJs novos
+_CACHE_CNPJ: dict[bool, dict[str, str]] = {False: {}, True: {}}
+
+
+def normalizar_cnpj(serie: pd.Series, raiz: bool = False) -> pd.Series:
+    """
+    Normaliza CNPJs: só dígitos, com zeros à esquerda (CNPJ_DIGITOS).
+
+    Equivale a .astype(str).str.strip().str.replace(r"\D", "").str.zfill(8)
+    (e .str[:8] com `raiz`), mas aplicado só aos valores distintos: a coluna
+    é fatorada, os valores ainda fora do cache são normalizados e os códigos
+    são mapeados de volta. Valores ausentes continuam ausentes.
+
+    Args:
+        serie: Coluna de CNPJ (texto ou número)
+        raiz: Mantém só os CNPJ_DIGITOS primeiros dígitos (raiz do CNPJ)
+
+    Returns:
+        Série category (categorias ordenadas) com o mesmo índice e nome
+    """
+    codigos, unicos = pd.factorize(serie)
+    chaves = [str(v) for v in unicos]
+
+    cache = _CACHE_CNPJ[raiz]
+    novos = [c for c in dict.fromkeys(chaves) if c not in cache]
+    if novos:
+        normalizados = (
+            pd.Series(novos, dtype=str)
+            .str.strip()
+            .str.replace(r"\D", "", regex=True)
+            .str.zfill(CNPJ_DIGITOS)
+        )
+        if raiz:
+            normalizados = normalizados.str[:CNPJ_DIGITOS]
+        cache.update(zip(novos, normalizados))
+
+    # Valores brutos diferentes podem normalizar igual ("13" e "0013")
+    mapa, categorias = pd.factorize(pd.Index([cache[c] for c in chaves], dtype=str), sort=True)
+    resultado = np.full(len(codigos), -1, dtype=np.int64)
+    presentes = codigos >= 0
+    resultado[presentes] = mapa[codigos[presentes]]
+    return pd.Series(
+        pd.Categorical.from_codes(resultado, categories=categorias),
+        index=serie.index,
+        name=serie.name,
+    )
+
+
+# ==============================================================================
+# MEDIÇÕES
+# ==============================================================================
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memória residente (RSS) do processo até agora, em MB (None sem `resource`)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: KB no Linux, bytes no macOS
+    return round(pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024, 1)
+
+
+def rss_atual_mb() -> Optional[float]:
+    """Memória residente (RSS) atual do processo, em MB (None sem /proc, ex.: macOS/Windows)."""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(paginas * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+class Medicoes:
+    """
+    Coleta as etapas (tempo, bytes, linhas, RSS) de uma execução.
+
+    Cada etapa é medida com o context manager etapa(), que entrega um dict
+    para o chamador preencher com bytes/linhas (ou outros campos). Seguro
+    entre threads; etapas medidas em outros processos voltam como lista
+    (atributo `etapas`) e entram com adicionar().
+
+    Cada etapa registra o RSS atual do processo ao seu fim (rss_mb); o
+    pico do processo inteiro (ru_maxrss) só entra no topo do relatório.
+
+    Uso:
+        medicoes = Medicoes()
+        with medicoes.etapa("download", "202301") as etapa:
+            conteudo = baixar(...)
+            etapa["bytes"] = len(conteudo)
+        medicoes.gravar(Path("execucao.json"), pipeline="estban")
+    """
+
+    def __init__(self):
+        self.etapas: list[dict] = []
+        self.inicio = datetime.now(timezone.utc)
+        self._inicio_relogio = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def etapa(self, nome: str, periodo: Optional[str] = None):
+        """Mede o bloco como etapa `nome` (do mês `periodo`, se houver); registra mesmo com exceção."""
+        registro = {"etapa": nome, "periodo": periodo, "bytes": 0, "linhas": 0}
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro["segundos"] = round(time.perf_counter() - inicio, 4)
+            registro["rss_mb"] = rss_atual_mb()
+            with self._lock:
+                self.etapas.append(registro)
+
+    def adicionar(self, etapas: list[dict]) -> None:
+        """Inclui etapas medidas em outro processo."""
+        with self._lock:
+            self.etapas.extend(etapas)
+
+    def resumo(self) -> dict:
+        """Totais por etapa: chamadas, segundos, bytes, linhas e maior RSS ao fim da etapa."""
+        resumo = {}
+        for registro in self.etapas:
+            total = resumo.setdefault(
+                registro["etapa"], {"chamadas": 0, "segundos": 0.0, "bytes": 0, "linhas": 0, "rss_mb": None}
+            )
+            total["chamadas"] += 1
+            total["segundos"] = round(total["segundos"] + registro["segundos"], 4)
+            total["bytes"] += registro["bytes"]
+            total["linhas"] += registro["linhas"]
+            if registro["rss_mb"] is not None:
+                total["rss_mb"] = max(total["rss_mb"] or 0.0, registro["rss_mb"])
+        return resumo
+
+    def por_periodo(self) -> dict:
+        """Etapas de cada mês: {periodo: {etapa: registro}} (várias do mesmo nome são somadas)."""
+        periodos = {}
+        for registro in sorted(
+            (r for r in self.etapas if r["periodo"] is not None), key=lambda r: r["periodo"]
+        ):
+            etapas = periodos.setdefault(registro["periodo"], {})
+            campos = {k: v for k, v in registro.items() if k not in ("etapa", "periodo")}
+            if registro["etapa"] in etapas:
+                anterior = etapas[registro["etapa"]]
+                for chave in ("segundos", "bytes", "linhas"):
+                    campos[chave] = anterior[chave] + campos[chave]
+            etapas[registro["etapa"]] = campos
+        return periodos
+
+    def gravar(self, caminho: Path, **metadados) -> dict:
+        """
+        Grava o relatório JSON da execução (atômico: temporário + rename).
+
+        Args:
+            caminho: Arquivo de destino
+            **metadados: Campos extras no topo do relatório (pipeline, status...)
+
+        Returns:
+            O relatório gravado
+        """
+        relatorio = {
+            **metadados,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "fim": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "duracao_s": round(time.perf_counter() - self._inicio_relogio, 3),
+            "rss_pico_mb": pico_rss_mb(),
+            "resumo": self.resumo(),
+            "periodos": self.por_periodo(),
+        }
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        tmp = caminho.with_name(f".{caminho.name}.tmp")
+        tmp.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp, caminho)
+        return relatorio
+
+
+def _rotulo_prometheus(valor) -> str:
+    """Valor de rótulo Prometheus com barra, aspas e quebra de linha escapadas."""
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def gravar_textfile_prometheus(caminho: Path, metricas: list[tuple[str, str, list[tuple[dict, float]]]]) -> None:
+    """
+    Grava métricas no formato texto do Prometheus (textfile collector do
+    node_exporter), de forma atômica para o coletor nunca ler pela metade.
+
+    Args:
+        caminho: Arquivo .prom de destino
+        metricas: Lista de (nome, ajuda, amostras), com amostras = [(rótulos, valor)];
+                  todas as métricas são do tipo gauge (métricas sem amostra são omitidas)
+    """
+    linhas = []
+    for nome, ajuda, amostras in metricas:
+        if not amostras:
+            continue
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} gauge")
+        for rotulos, valor in amostras:
+            texto = ",".join(f'{chave}="{_rotulo_prometheus(v)}"' for chave, v in rotulos.items())
+            valor = int(valor) if isinstance(valor, (bool, int)) else float(valor)
+            linhas.append(f"{nome}{{{texto}}} {valor}" if texto else f"{nome} {valor}")
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    tmp = caminho.with_name(f".{caminho.name}.tmp")
+    tmp.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    os.replace(tmp, caminho)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+BENCHMARK - LEITURA E TIPAGEM NA CONSOLIDAÇÃO DE COOPERADOS
+================================================================================
+Compara, nos ZIPs mensais do cache do pipeline, a leitura antiga de
+consolidar() (tudo como texto, Periodo "DD/MM/AAAA" por linha e conversão
+pós-concatenação com pd.to_numeric / pd.to_datetime(...).dt.strftime) com a
+atual (contagens Int32 na leitura, sem a coluna Nome, e Periodo como data
+constante por arquivo).
+
+Uso:
+    python pipeline_cooperados.py          # popula o cache (_cache/)
+    python benchmarks/bench_consolidar.py
+    python benchmarks/bench_consolidar.py --pasta /caminho/para/_cache
+================================================================================
+"""
+
+import io
+import sys
+import time
+import argparse
+import statistics
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pipeline_cooperados as coop  # noqa: E402
+
+
+def _consolidar_legado(arquivos: dict) -> pd.DataFrame:
+    """Leitura e tipagem como eram feitas em consolidar()."""
+    dfs = []
+    for periodo, (zip_path, membro) in sorted(arquivos.items()):
+        with zipfile.ZipFile(zip_path, "r") as zf, zf.open(membro) as csv_stream:
+            df = pd.read_csv(
+                csv_stream,
+                skiprows=coop.LINHAS_PULAR,
+                sep=";",
+                encoding="latin-1",
+                dtype=str,
+                on_bad_lines="warn",
+                keep_default_na=False,
+            )
+        df = coop.remover_rodape(df)
+        df["Periodo"] = f"01/{periodo[4:6]}/{periodo[:4]}"
+        dfs.append(df)
+
+    df_final = pd.concat(dfs, ignore_index=True)
+    df_final = df_final.drop(columns=["Nome"])
+    for col in coop.COLUNAS_INT:
+        if col in df_final.columns:
+            df_final[col] = pd.to_numeric(df_final[col], errors="coerce").fillna(0).astype(int)
+    df_final["Periodo"] = pd.to_datetime(df_final["Periodo"], format="%d/%m/%Y").dt.strftime("%Y-%m-%d")
+    return df_final
+
+
+def _consolidar_atual(arquivos: dict) -> pd.DataFrame:
+    """Leitura tipada atual (ler_csv_zip + Periodo constante)."""
+    dfs = []
+    for periodo, (zip_path, membro) in sorted(arquivos.items()):
+        df = coop.ler_csv_zip(zip_path, membro)
+        df["Periodo"] = pd.Timestamp(int(periodo[:4]), int(periodo[4:6]), 1)
+        dfs.append(df)
+
+    df_final = pd.concat(dfs, ignore_index=True)
+    for col in coop.COLUNAS_INT:
+        if col in df_final.columns:
+            df_final[col] = df_final[col].fillna(0)
+    return df_final
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Mediana do tempo de `repeticoes` execuções (segundos)."""
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da leitura tipada de cooperados")
+    parser.add_argument("--pasta", type=Path, default=coop.PASTA_CACHE, help="Pasta com os ZIPs mensais")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Repetições por medida (padrão: 5)")
+    args = parser.parse_args()
+
+    arquivos = {}
+    for zip_path in sorted(args.pasta.glob("*.zip")):
+        membro = coop.localizar_csv(zip_path, zip_path.stem)
+        if membro:
+            arquivos[zip_path.stem] = (zip_path, membro)
+    if not arquivos:
+        print(f"[ERRO] Nenhum ZIP em {args.pasta} (rode o pipeline antes)")
+        return 1
+
+    legado = _consolidar_legado(arquivos)
+    atual = _consolidar_atual(arquivos)
+    print(f"ZIPs: {len(arquivos)} │ {len(atual):,} linhas")
+    print(f"Memória: {legado.memory_usage(deep=True).sum() / 2**20:.1f} MB → "
+          f"{atual.memory_usage(deep=True).sum() / 2**20:.1f} MB")
+
+    t_leitura_legado = _medir(lambda: _consolidar_legado(arquivos), args.repeticoes)
+    t_leitura_atual = _medir(lambda: _consolidar_atual(arquivos), args.repeticoes)
+
+    t_csv_legado = _medir(
+        lambda: legado.to_csv(io.StringIO(), index=False, sep=";"), args.repeticoes
+    )
+    t_csv_atual = _medir(
+        lambda: atual.to_csv(io.StringIO(), index=False, sep=";", date_format="%Y-%m-%d"), args.repeticoes
+    )
+
+    print()
+    print(f"{'Etapa':<28}{'Antes':>10}{'Depois':>10}{'Ganho':>9}")
+    print("-" * 57)
+    for nome, antes, depois in [
+        ("Leitura + tipagem", t_leitura_legado, t_leitura_atual),
+        ("Gravação do CSV", t_csv_legado, t_csv_atual),
+    ]:
+        print(f"{nome:<28}{antes:>9.3f}s{depois:>9.3f}s{antes / depois:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+BENCHMARK - PIPELINES COMPLETOS CONTRA O SERVIDOR LOCAL (OFFLINE)
+================================================================================
+Sobe o servidor_bcb.py com dados sintéticos e roda executar_pipeline
+(ESTBAN) e pipeline_cooperados.main contra ele, gravando tudo numa pasta
+temporária (sem git push, sem tocar em dados/). Cada pipeline roda
+`--execucoes` vezes: a primeira com cache frio, as seguintes com o cache
+da anterior.
+
+Mede o tempo total e o tempo por etapa (soma das chamadas às funções de
+download, leitura, transformação e gravação). Downloads rodam em threads,
+então a soma da etapa pode passar do tempo total. Com --jobs > 1 a leitura
+e a transformação rodam em outros processos e não entram na soma.
+
+Uso:
+    python benchmarks/bench_e2e.py
+    python benchmarks/bench_e2e.py --inicio 2023-01 --fim 2024-12 --municipios 1000
+    python benchmarks/bench_e2e.py --so estban --latencia 0.2 --erros 0.05 --workers 8
+================================================================================
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import functools
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from servidor_bcb import CAMINHO_API_COOPERADOS, CAMINHO_COOPERADOS, CAMINHO_ESTBAN, ServidorBCB  # noqa: E402
+
+# Funções medidas em cada pipeline: (nome no módulo, etapa)
+ETAPAS_ESTBAN = [
+    ("download_arquivo", "download"),
+    ("extrair_csv_de_bytes", "leitura"),
+    ("transformar_dataframe", "transformação"),
+    ("salvar_csv", "gravação CSV"),
+    ("salvar_parquet", "gravação Parquet"),
+    ("salvar_particoes", "partições"),
+    ("atualizar_readme", "README"),
+]
+ETAPAS_COOPERADOS = [
+    ("obter_urls_api", "API"),
+    ("download_zip", "download"),
+    ("ler_periodo", "leitura"),
+    ("consolidar", "consolidação (total)"),
+    ("salvar_parquet", "gravação Parquet"),
+    ("atualizar_readme", "README"),
+]
+
+
+class Cronometro:
+    """Substitui funções de um módulo por versões que somam o tempo gasto."""
+
+    def __init__(self):
+        self.etapas = {}
+        self._originais = []
+
+    def medir(self, modulo, nome: str, etapa: str) -> None:
+        original = getattr(modulo, nome)
+
+        @functools.wraps(original)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                chamadas, segundos = self.etapas.get(etapa, (0, 0.0))
+                self.etapas[etapa] = (chamadas + 1, segundos + time.perf_counter() - inicio)
+
+        setattr(modulo, nome, medida)
+        self._originais.append((modulo, nome, original))
+
+    def restaurar(self) -> None:
+        for modulo, nome, original in reversed(self._originais):
+            setattr(modulo, nome, original)
+        self._originais.clear()
+
+
+def _redirecionar_saida(modulo, raiz_antiga: Path, raiz_nova: Path) -> None:
+    """Troca os caminhos do módulo sob `raiz_antiga` pelos equivalentes em `raiz_nova`."""
+    for nome, valor in list(vars(modulo).items()):
+        if isinstance(valor, Path) and valor.is_relative_to(raiz_antiga):
+            setattr(modulo, nome, raiz_nova / valor.relative_to(raiz_antiga))
+
+
+@contextlib.contextmanager
+def _silencioso(ativo: bool):
+    """Descarta stdout/stderr dos pipelines (barras de progresso e logs)."""
+    if not ativo:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def rodar_estban(servidor: ServidorBCB, pasta: Path, args) -> float:
+    """Roda executar_pipeline do ESTBAN uma vez e retorna o tempo total."""
+    import pipeline_estban as estban
+
+    _redirecionar_saida(estban, estban.REPO_DIR, pasta)
+    estban.BCB_BASE_URL = servidor.url + CAMINHO_ESTBAN
+
+    inicio = time.perf_counter()
+    try:
+        with _silencioso(not args.verbose):
+            estban.executar_pipeline(
+                args.inicio,
+                args.fim,
+                fazer_push=False,
+                workers=args.workers,
+                jobs=args.jobs,
+            )
+    except SystemExit as e:
+        print(f"  [AVISO] ESTBAN terminou com código {e.code}")
+    return time.perf_counter() - inicio
+
+
+def rodar_cooperados(servidor: ServidorBCB, pasta: Path, args) -> float:
+    """Roda pipeline_cooperados.main uma vez e retorna o tempo total."""
+    os.environ["GITHUB_WORKSPACE"] = str(pasta)
+    import pipeline_cooperados as coop
+
+    _redirecionar_saida(coop, coop.REPO_ROOT, pasta)
+    coop.REPO_ROOT = pasta
+    coop.BCB_BASE = servidor.url
+    coop.BCB_API = servidor.url + CAMINHO_API_COOPERADOS
+    coop.URL_NOVO = f"{servidor.url}{CAMINHO_COOPERADOS}/{{yyyymm}}CCOCOOPERATIVA.zip"
+    coop.URL_ANTIGO = f"{servidor.url}{CAMINHO_COOPERADOS}/{{yyyymm}}CCOCooperativa.zip"
+    (coop.ANO_INICIO, coop.MES_INICIO) = map(int, args.inicio.split("-"))
+    (coop.ANO_FIM, coop.MES_FIM) = map(int, args.fim.split("-"))
+    if not args.verbose:
+        coop.log.setLevel(logging.WARNING)
+
+    argv = sys.argv
+    sys.argv = [
+        "pipeline_cooperados.py", "--no-push",
+        "--workers", str(args.workers), "--taxa", str(args.taxa), "--jobs", str(args.jobs),
+    ]
+    inicio = time.perf_counter()
+    try:
+        with _silencioso(not args.verbose):
+            coop.main()
+    finally:
+        sys.argv = argv
+    return time.perf_counter() - inicio
+
+
+def _imprimir(nome: str, execucao: int, total: float, cronometro: Cronometro, antes: dict, depois: dict):
+    rotulo = "cache frio" if execucao == 1 else "cache quente"
+    print(f"\n{nome} - execução {execucao} ({rotulo}): {total:.2f}s")
+    print(f"  {'Etapa':<24}{'Chamadas':>9}{'Tempo':>10}")
+    print("  " + "-" * 43)
+    for etapa, (chamadas, segundos) in cronometro.etapas.items():
+        print(f"  {etapa:<24}{chamadas:>9}{segundos:>9.2f}s")
+    delta = {k: depois[k] - antes[k] for k in depois}
+    print(
+        f"  Servidor: {delta['requisicoes']} requisições │ {delta['bytes'] / 2**20:.1f} MB │ "
+        f"{delta['nao_modificado']} × 304 │ {delta['erros']} × 503 │ {delta['nao_encontrado']} × 404"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline dos pipelines BCB")
+    parser.add_argument("--inicio", default="2023-01", help="Primeiro mês YYYY-MM (padrão: 2023-01)")
+    parser.add_argument("--fim", default="2023-12", help="Último mês YYYY-MM (padrão: 2023-12)")
+    parser.add_argument("--so", choices=["estban", "cooperados"], help="Roda só um dos pipelines")
+    parser.add_argument("--execucoes", type=int, default=2, help="Execuções por pipeline (padrão: 2)")
+    parser.add_argument("--municipios", type=int, default=300, help="Municípios por mês no ESTBAN")
+    parser.add_argument("--instituicoes", type=int, default=40, help="Instituições no ESTBAN")
+    parser.add_argument("--cooperativas", type=int, default=800, help="Cooperativas por mês")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Latência por requisição (s)")
+    parser.add_argument("--erros", type=float, default=0.0, help="Fração de respostas 503")
+    parser.add_argument("--workers", type=int, default=4, help="Downloads simultâneos")
+    parser.add_argument("--jobs", type=int, default=1, help="Processos de leitura/transformação")
+    parser.add_argument("--taxa", type=float, default=0, help="Requisições/s dos cooperados (0 = sem limite)")
+    parser.add_argument("--saida", type=Path, help="Pasta de saída (padrão: temporária, apagada no fim)")
+    parser.add_argument("--verbose", action="store_true", help="Mostra a saída dos pipelines")
+    args = parser.parse_args()
+
+    pasta = args.saida or Path(tempfile.mkdtemp(prefix="bench_bcb_"))
+    servidor = ServidorBCB(
+        latencia=args.latencia,
+        erros=args.erros,
+        municipios=args.municipios,
+        instituicoes=args.instituicoes,
+        cooperativas=args.cooperativas,
+    ).iniciar()
+    print(f"Servidor: {servidor.url} │ meses {args.inicio} a {args.fim} │ pasta {pasta}")
+    print("Gerando dados sintéticos...")
+    servidor.pregerar(args.inicio, args.fim)
+
+    pipelines = [
+        ("ESTBAN", rodar_estban, ETAPAS_ESTBAN, "pipeline_estban"),
+        ("Cooperados", rodar_cooperados, ETAPAS_COOPERADOS, "pipeline_cooperados"),
+    ]
+    try:
+        for nome, rodar, etapas, modulo in pipelines:
+            if args.so and args.so != nome.lower():
+                continue
+            destino = pasta / nome.lower()
+            for execucao in range(1, args.execucoes + 1):
+                # Importa antes de medir (o módulo de cooperados lê o ambiente no import)
+                if modulo == "pipeline_cooperados":
+                    os.environ["GITHUB_WORKSPACE"] = str(destino)
+                mod = __import__(modulo)
+                cronometro = Cronometro()
+                for funcao, etapa in etapas:
+                    cronometro.medir(mod, funcao, etapa)
+                antes = dict(servidor.estatisticas)
+                try:
+                    total = rodar(servidor, destino, args)
+                finally:
+                    cronometro.restaurar()
+                _imprimir(nome, execucao, total, cronometro, antes, dict(servidor.estatisticas))
+    finally:
+        servidor.shutdown()
+        if args.saida is None:
+            shutil.rmtree(pasta, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
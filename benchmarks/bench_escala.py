@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+BENCHMARK - ESCALA DA TRANSFORMAÇÃO E CONSOLIDAÇÃO DO ESTBAN (OFFLINE)
+================================================================================
+Gera meses ESTBAN sintéticos (gerador_estban.py) em volumes crescentes e
+mede, sem rede, as etapas do pipeline que crescem com o volume:
+
+    leitura        extrair_csv_de_bytes (ZIP → DataFrame bruto)
+    transformação  transformar_dataframe
+    consolidação   _unificar_categorias + concat + sort + drop_duplicates
+    gravação CSV   salvar_csv (.csv em pasta temporária; .csv.gz só acima do limite)
+
+Cada fator multiplica o número de municípios por mês (registros/mês);
+--meses define quantos meses entram na consolidação. A geração dos dados
+não entra nos tempos.
+
+Uso:
+    python benchmarks/bench_escala.py
+    python benchmarks/bench_escala.py --fatores 1 10 100 --meses 33
+    python benchmarks/bench_escala.py --municipios 5570 --instituicoes 150 --fatores 1
+================================================================================
+"""
+
+import io
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pipeline_estban as estban  # noqa: E402
+from gerador_estban import (  # noqa: E402
+    INSTITUICOES_DEFAULT,
+    MUNICIPIOS_DEFAULT,
+    compactar,
+    gerar_estban_csv,
+)
+
+
+def _medir(tempos: dict, etapa: str, funcao, *args):
+    """Executa `funcao` somando o tempo em tempos[etapa]."""
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    tempos[etapa] = tempos.get(etapa, 0.0) + time.perf_counter() - inicio
+    return resultado
+
+
+def _consolidar(dfs: list[pd.DataFrame]) -> pd.DataFrame:
+    """Mesma sequência de executar_pipeline (modo completo)."""
+    estban._unificar_categorias(dfs)
+    df_final = pd.concat(dfs, ignore_index=True)
+    df_final = df_final.sort_values(["Período", "CODMUN", "CNPJ"], ignore_index=True)
+    return df_final.drop_duplicates()
+
+
+def rodar(periodos: list[str], municipios: int, args, pasta: Path) -> tuple[int, float, float, dict]:
+    """
+    Gera e processa os meses em um volume.
+
+    Returns:
+        (registros consolidados, MB dos ZIPs, MB do consolidado em memória,
+        {etapa: segundos})
+    """
+    tempos = {}
+    dfs = []
+    zip_mb = 0.0
+    inicio = time.perf_counter()
+    arquivos = []
+    for yyyymm in periodos:
+        csv = gerar_estban_csv(yyyymm, municipios, args.instituicoes, args.semente)
+        arquivos.append((yyyymm, compactar(f"{yyyymm}_ESTBAN.CSV", csv)))
+        zip_mb += len(arquivos[-1][1]) / (1024 * 1024)
+    geracao = time.perf_counter() - inicio
+
+    for yyyymm, conteudo in arquivos:
+        df = _medir(tempos, "leitura", estban.extrair_csv_de_bytes, conteudo, f"{yyyymm}_ESTBAN.csv.zip")
+        dfs.append(_medir(tempos, "transformação", estban.transformar_dataframe, df, yyyymm))
+    del arquivos
+
+    df_final = _medir(tempos, "consolidação", _consolidar, dfs)
+    del dfs
+
+    estban.OUTPUT_FILE = pasta / "estban_municipal_estrategico.csv"
+    with contextlib.redirect_stdout(io.StringIO()):
+        _medir(tempos, "gravação CSV", estban.salvar_csv, df_final)
+
+    tempos["geração (fora)"] = geracao
+    return len(df_final), zip_mb, estban._memoria_mb(df_final), tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escala do ESTBAN com dados sintéticos")
+    parser.add_argument("--fatores", type=int, nargs="+", default=[1, 10],
+                        help="Multiplicadores do número de municípios (padrão: 1 10)")
+    parser.add_argument("--inicio", default="2020-01", help="Primeiro mês YYYY-MM (padrão: 2020-01)")
+    parser.add_argument("--meses", type=int, default=12, help="Meses consolidados (padrão: 12)")
+    parser.add_argument("--municipios", type=int, default=MUNICIPIOS_DEFAULT,
+                        help=f"Municípios no fator 1 (padrão: {MUNICIPIOS_DEFAULT})")
+    parser.add_argument("--instituicoes", type=int, default=INSTITUICOES_DEFAULT,
+                        help=f"Instituições distintas (padrão: {INSTITUICOES_DEFAULT})")
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos dados sintéticos")
+    args = parser.parse_args()
+
+    periodos = [p.strftime("%Y%m") for p in pd.period_range(args.inicio, periods=args.meses, freq="M")]
+    pasta = Path(tempfile.mkdtemp(prefix="bench_escala_"))
+    saida_original = estban.OUTPUT_FILE
+    try:
+        for fator in args.fatores:
+            municipios = args.municipios * fator
+            registros, zip_mb, memoria_mb, tempos = rodar(periodos, municipios, args, pasta)
+            processamento = sum(s for etapa, s in tempos.items() if etapa != "geração (fora)")
+
+            print(f"\nFator {fator}× │ {municipios:,} municípios × {len(periodos)} meses │ "
+                  f"{registros:,} registros │ ZIPs {zip_mb:.1f} MB │ consolidado {memoria_mb:.1f} MB")
+            print(f"  {'Etapa':<18}{'Tempo':>10}{'Registros/s':>14}")
+            print("  " + "-" * 42)
+            for etapa, segundos in tempos.items():
+                taxa = f"{registros / segundos:>14,.0f}" if segundos and etapa != "geração (fora)" else ""
+                print(f"  {etapa:<18}{segundos:>9.2f}s{taxa}")
+            print(f"  {'total':<18}{processamento:>9.2f}s{registros / processamento:>14,.0f}")
+    finally:
+        estban.OUTPUT_FILE = saida_original
+        shutil.rmtree(pasta, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+BENCHMARK - EXTRAÇÃO/TRANSFORMAÇÃO ESTBAN EM 1 vs N PROCESSOS
+================================================================================
+Mede o tempo da etapa de extração + transformação (processar_periodos) com
+1 processo e com N processos, a partir de arquivos já baixados, isolando a
+etapa de CPU da rede.
+
+Uso:
+    python benchmarks/bench_jobs.py --inicio 2025-01 --fim 2025-09 --jobs 4
+    python benchmarks/bench_jobs.py --arquivos /tmp/estban/*.csv.zip --jobs 4
+
+    Com --inicio/--fim os arquivos vêm do cache local do pipeline
+    (dados/bcb/estban/_cache/); só o que faltar é baixado do BCB.
+================================================================================
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pipeline_estban as estban  # noqa: E402
+
+
+def _carregar(args) -> list[tuple[dict, bytes]]:
+    """Monta a lista (item, conteudo) que processar_periodos consome."""
+    downloads = []
+    if args.arquivos:
+        for arquivo in args.arquivos:
+            m = re.search(r"(\d{6})", arquivo.name)
+            periodo = m.group(1) if m else "000001"
+            item = {"periodo": periodo, "label": f"{periodo[4:]}/{periodo[:4]}", "urls": [arquivo.name]}
+            downloads.append((item, arquivo.read_bytes()))
+        return downloads
+
+    for item in estban.gerar_periodos(args.inicio, args.fim):
+        conteudo = estban.download_arquivo(item["urls"], item["label"], cache_dir=estban.CACHE_DIR)
+        if conteudo is None:
+            print(f"  [AVISO] {item['label']} indisponível, ignorado")
+            continue
+        downloads.append((item, conteudo))
+    return downloads
+
+
+def _medir(downloads: list, jobs: int) -> tuple[float, int]:
+    """Tempo total e registros gerados com `jobs` processos."""
+    t0 = time.perf_counter()
+    registros = sum(
+        len(df) for _, _, df, _ in estban.processar_periodos(iter(downloads), jobs) if df is not None
+    )
+    return time.perf_counter() - t0, registros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark 1 vs N processos (ESTBAN)")
+    parser.add_argument("--inicio", default="2025-01", help="Período inicial YYYY-MM (padrão: 2025-01)")
+    parser.add_argument("--fim", default="2025-09", help="Período final YYYY-MM (padrão: 2025-09)")
+    parser.add_argument("--arquivos", type=Path, nargs="+", help="Arquivos ESTBAN locais (ignora --inicio/--fim)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2, help="Processos na rodada paralela")
+    args = parser.parse_args()
+
+    downloads = _carregar(args)
+    if not downloads:
+        print("[ERRO] Nenhum arquivo disponível")
+        return 1
+
+    tamanho = sum(len(c) for _, c in downloads) / 2**20
+    print(f"Meses: {len(downloads)} │ {tamanho:.1f} MB │ CPUs: {os.cpu_count()}")
+    print()
+    print(f"{'Processos':>10}{'Tempo':>10}{'Meses/s':>10}{'Registros':>12}{'Ganho':>8}")
+    print("-" * 50)
+
+    base = None
+    for jobs in dict.fromkeys([1, args.jobs]):
+        tempo, registros = _medir(downloads, jobs)
+        base = base or tempo
+        print(f"{jobs:>10}{tempo:>9.2f}s{len(downloads) / tempo:>10.1f}{registros:>12,}{base / tempo:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+BENCHMARK - CONVERSÃO NUMÉRICA DOS VERBETES ESTBAN
+================================================================================
+Compara, em um arquivo mensal real do BCB, a conversão numérica antiga
+(4 operações .str por coluna, coluna a coluna) com a atual (conversão na
+leitura com decimal=',' / thousands='.' e limpeza de texto em uma passada).
+
+Uso:
+    python benchmarks/bench_numerico.py --periodo 2025-09
+    python benchmarks/bench_numerico.py --arquivo 202509_ESTBAN.csv.zip
+
+    O download usa o cache local do pipeline (dados/bcb/estban/_cache/),
+    então só a primeira execução acessa o BCB.
+================================================================================
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pipeline_estban as estban  # noqa: E402
+
+
+def _converter_numerico_legado(serie: pd.Series) -> pd.Series:
+    """Implementação anterior (uma série por vez)."""
+    return (
+        serie
+        .astype(str)
+        .str.strip()
+        .str.replace(".", "", regex=False)
+        .str.replace(",", ".", regex=False)
+        .str.replace(r"[^\d.\-]", "", regex=True)
+        .pipe(pd.to_numeric, errors="coerce")
+        .fillna(0.0)
+    )
+
+
+def _converter_legado(df: pd.DataFrame, colunas_verbete: dict) -> None:
+    """Conversão como era feita em transformar_dataframe."""
+    for num in estban.VERBETES_INDIVIDUAIS:
+        if num in colunas_verbete:
+            _converter_numerico_legado(df[colunas_verbete[num]])
+    cols_dep_vista = [colunas_verbete[n] for n in estban.VERBETES_DEP_VISTA if n in colunas_verbete]
+    if cols_dep_vista:
+        df[cols_dep_vista].apply(_converter_numerico_legado).sum(axis=1)
+
+
+def _ler_texto(conteudo: bytes, url: str) -> pd.DataFrame:
+    """Lê o arquivo com todas as colunas estratégicas como texto (leitura antiga)."""
+    original = estban._colunas_necessarias
+
+    def _tudo_texto(colunas):
+        texto, numericas = original(colunas)
+        return texto | numericas, set()
+
+    estban._colunas_necessarias = _tudo_texto
+    try:
+        return estban.extrair_csv_de_bytes(conteudo, url)
+    finally:
+        estban._colunas_necessarias = original
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Mediana do tempo de `repeticoes` execuções (segundos)."""
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    return statistics.median(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da conversão numérica ESTBAN")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--periodo", help="Período YYYY-MM a baixar do BCB (usa o cache)")
+    grupo.add_argument("--arquivo", type=Path, help="Arquivo ESTBAN local (.csv.zip ou .csv)")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Repetições por medida (padrão: 5)")
+    args = parser.parse_args()
+
+    if args.arquivo:
+        conteudo = args.arquivo.read_bytes()
+        url = args.arquivo.name
+    else:
+        item = estban.gerar_periodos(args.periodo, args.periodo)[0]
+        conteudo = estban.download_arquivo(item["urls"], item["label"], cache_dir=estban.CACHE_DIR)
+        if conteudo is None:
+            print(f"[ERRO] Não foi possível baixar {item['label']}")
+            return 1
+        url = item["urls"][0]
+
+    df_texto = _ler_texto(conteudo, url)
+    colunas_verbete = estban.identificar_colunas_verbetes(df_texto.columns.tolist())
+    cols = list(dict.fromkeys(colunas_verbete.values()))
+    print(f"Arquivo: {len(conteudo) / 2**20:.1f} MB │ {len(df_texto):,} linhas │ {len(cols)} verbetes")
+
+    # 1. Só a conversão, partindo das mesmas colunas texto
+    t_conv_legado = _medir(lambda: _converter_legado(df_texto, colunas_verbete), args.repeticoes)
+    t_conv_novo = _medir(lambda: estban._converter_numerico(df_texto[cols]), args.repeticoes)
+
+    # 2. Leitura + conversão (a atual converte no parser C)
+    t_total_legado = _medir(
+        lambda: _converter_legado(_ler_texto(conteudo, url), colunas_verbete), args.repeticoes
+    )
+    t_total_novo = _medir(
+        lambda: estban._converter_numerico(estban.extrair_csv_de_bytes(conteudo, url)[cols]),
+        args.repeticoes,
+    )
+
+    print()
+    print(f"{'Etapa':<28}{'Antes':>10}{'Depois':>10}{'Ganho':>9}")
+    print("-" * 57)
+    for nome, antes, depois in [
+        ("Conversão (texto)", t_conv_legado, t_conv_novo),
+        ("Leitura + conversão", t_total_legado, t_total_novo),
+    ]:
+        print(f"{nome:<28}{antes:>9.3f}s{depois:>9.3f}s{antes / depois:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
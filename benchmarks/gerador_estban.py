@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+GERADOR SINTÉTICO - ARQUIVOS MENSAIS ESTBAN
+================================================================================
+Gera arquivos mensais no formato do ESTBAN por município do BCB para testes
+de escala offline (qualquer número de municípios, instituições e meses):
+
+    - 2 linhas de preâmbulo antes do cabeçalho (como o BCB publica)
+    - Cabeçalho #DATA_BASE;UF;CODMUN_IBGE;CODMUN;MUNICIPIO;CNPJ;... e
+      colunas VERBETE_<nnn>_<NOME>
+    - latin-1, separador ';', números no formato BR (parte dos valores com
+      milhar '.' e decimal ',', parte só inteiros, zeros frequentes)
+    - CNPJ como raiz de 8 dígitos, às vezes sem zeros à esquerda
+
+A estrutura (municípios × instituições presentes) depende só da semente e
+se repete em todos os meses; os valores mudam por mês. Mesma semente e
+parâmetros → mesmos bytes. Usado por servidor_bcb.py e bench_escala.py.
+
+Uso:
+    python benchmarks/gerador_estban.py --saida /tmp/estban
+    python benchmarks/gerador_estban.py --inicio 2015-01 --fim 2024-12 \\
+        --municipios 5570 --instituicoes 150 --saida /tmp/estban_100x
+    python benchmarks/gerador_estban.py --formato csv --saida /tmp/estban_csv
+================================================================================
+"""
+
+import io
+import sys
+import time
+import zipfile
+import argparse
+import functools
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+
+ENCODING = "latin-1"
+
+# Data fixa nos ZIPs (bytes reprodutíveis)
+DATA_FIXA = (2024, 1, 1, 0, 0, 0)
+
+# Verbetes gerados (número → sufixo do nome da coluna)
+VERBETES = {
+    110: "DISPONIBILIDADES",
+    111: "CAIXA",
+    112: "DEPOSITOS_BANCARIOS",
+    160: "OPERACOES_DE_CREDITO",
+    161: "EMPRESTIMOS_E_TITULOS_DESCONTADOS",
+    162: "FINANCIAMENTOS",
+    163: "FINANCIAMENTOS_RURAIS_AGRICULTURA",
+    167: "FINANCIAMENTOS_AGROINDUSTRIAIS",
+    169: "FINANCIAMENTOS_IMOBILIARIOS",
+    171: "OUTRAS_OPERACOES_DE_CREDITO",
+    172: "OUTROS_CREDITOS",
+    174: "PROVISAO_PARA_OPERACOES_DE_CREDITOS",
+    176: "OPERACOES_DE_ARRENDAMENTO_MERCANTIL",
+    180: "TITULOS_E_VALORES_MOBILIARIOS",
+    184: "OUTROS_VALORES_E_BENS",
+    399: "TOTAL_DO_ATIVO",
+    **{v: f"DEPOSITOS_A_VISTA_{v - 400:02d}" for v in range(401, 420)},
+    420: "DEPOSITOS_DE_POUPANCA",
+    432: "DEPOSITOS_A_PRAZO",
+    499: "OUTRAS_OBRIGACOES",
+    610: "PATRIMONIO_LIQUIDO",
+    899: "TOTAL_DO_PASSIVO",
+}
+
+# Componentes somados em 160 (Operações de Crédito), para KPIs plausíveis
+COMPONENTES_CREDITO = [161, 162, 163, 167, 169, 171]
+
+# UFs (sigla, código IBGE)
+UFS = [
+    ("RO", 11), ("AC", 12), ("AM", 13), ("RR", 14), ("PA", 15), ("AP", 16), ("TO", 17),
+    ("MA", 21), ("PI", 22), ("CE", 23), ("RN", 24), ("PB", 25), ("PE", 26), ("AL", 27),
+    ("SE", 28), ("BA", 29), ("MG", 31), ("ES", 32), ("RJ", 33), ("SP", 35), ("PR", 41),
+    ("SC", 42), ("RS", 43), ("MS", 50), ("MT", 51), ("GO", 52), ("DF", 53),
+]
+
+# Padrões
+MUNICIPIOS_DEFAULT = 300
+INSTITUICOES_DEFAULT = 40
+POR_MUNICIPIO_DEFAULT = 3.5   # média de instituições por município
+FRACAO_ZEROS = 0.35           # verbetes zerados
+FRACAO_MILHAR = 0.3           # valores com separador de milhar e centavos
+FRACAO_DECIMAL = 0.2          # valores com centavos, sem milhar
+
+
+# ==============================================================================
+# GERAÇÃO
+# ==============================================================================
+
+def meses(inicio: str, fim: str) -> list[str]:
+    """Meses YYYYMM de `inicio` a `fim` (YYYY-MM), inclusive."""
+    return [p.strftime("%Y%m") for p in pd.period_range(inicio, fim, freq="M")]
+
+
+@functools.lru_cache(maxsize=8)
+def _estrutura(municipios: int, instituicoes: int, por_municipio: float, semente: int) -> pd.DataFrame:
+    """
+    Linhas fixas do arquivo: uma por (município, instituição presente).
+
+    Instituições grandes (índices baixos) aparecem em mais municípios
+    (pesos ~ 1/rank), e o número por município segue uma geométrica.
+    """
+    rng = np.random.default_rng([semente, 0])
+
+    ufs = rng.integers(0, len(UFS), municipios)
+    sequencia = pd.Series(ufs).groupby(ufs).cumcount().to_numpy() + 1
+    codigo_uf = np.array([codigo for _, codigo in UFS])[ufs]
+
+    pesos = 1.0 / np.arange(1, instituicoes + 1)
+    pesos /= pesos.sum()
+    quantidades = np.minimum(rng.geometric(1.0 / max(por_municipio, 1.0), municipios), instituicoes)
+    presentes = [
+        np.sort(rng.choice(instituicoes, n, replace=False, p=pesos)) for n in quantidades
+    ]
+
+    municipio = np.repeat(np.arange(municipios), quantidades)
+    instituicao = np.concatenate(presentes) if presentes else np.array([], dtype=int)
+
+    # Raízes de CNPJ distintas; as primeiras com zeros à esquerda (como o BB)
+    raizes = rng.choice(10**8, instituicoes, replace=False)
+    raizes[: min(3, instituicoes)] //= 10**4
+
+    return pd.DataFrame({
+        "UF": np.array([sigla for sigla, _ in UFS])[ufs][municipio],
+        "CODMUN_IBGE": (codigo_uf * 100000 + sequencia * 10)[municipio].astype(str),
+        "CODMUN": (1000 + municipio).astype(str),
+        "MUNICIPIO": np.char.add("MUNICIPIO ", municipio.astype(str)),
+        "CNPJ": raizes[instituicao].astype(str),
+        "NOME_INSTITUICAO": np.char.add("INSTITUICAO ", instituicao.astype(str)),
+        "AGEN_ESPERADAS": (1 + (instituicao == 0) * municipio % 7).astype(str),
+    })
+
+
+def _formatar_br(centavos: np.ndarray, estilo: np.ndarray) -> np.ndarray:
+    """
+    Valores em centavos → texto no formato BR.
+
+    estilo 0: inteiro em reais ("1234567"); 1: com centavos ("1234567,89");
+    2: com milhar e centavos ("1.234.567,89"). Zero sai sempre "0".
+    """
+    reais, cents = np.divmod(np.abs(centavos), 100)
+    texto = reais.astype(str).astype(object)
+    milhar = estilo == 2
+    if milhar.any():
+        texto[milhar] = [f"{r:,}".replace(",", ".") for r in reais[milhar].tolist()]
+    com_cents = estilo > 0
+    texto[com_cents] = texto[com_cents] + "," + np.char.zfill(cents[com_cents].astype(str), 2).astype(object)
+    texto[centavos < 0] = "-" + texto[centavos < 0]
+    texto[centavos == 0] = "0"
+    return texto
+
+
+def gerar_estban_df(
+    yyyymm: str,
+    municipios: int = MUNICIPIOS_DEFAULT,
+    instituicoes: int = INSTITUICOES_DEFAULT,
+    semente: int = 0,
+    por_municipio: float = POR_MUNICIPIO_DEFAULT,
+) -> pd.DataFrame:
+    """Dados de um mês já formatados como texto, na ordem das colunas do arquivo."""
+    base = _estrutura(municipios, instituicoes, por_municipio, semente)
+    rng = np.random.default_rng([semente, int(yyyymm)])
+    linhas = len(base)
+
+    # Valores em centavos: log-normal (cauda longa), com zeros frequentes
+    valores = np.rint(rng.lognormal(13.0, 2.5, (linhas, len(VERBETES))) * 100).astype(np.int64)
+    valores = np.minimum(valores, 10**13)
+    valores[rng.random(valores.shape) < FRACAO_ZEROS] = 0
+    estilo = np.searchsorted(
+        np.cumsum([1 - FRACAO_DECIMAL - FRACAO_MILHAR, FRACAO_DECIMAL]), rng.random(valores.shape), side="right"
+    )
+    valores[estilo == 0] -= valores[estilo == 0] % 100
+
+    indice = {v: i for i, v in enumerate(VERBETES)}
+    credito = valores[:, [indice[v] for v in COMPONENTES_CREDITO]].sum(axis=1)
+    valores[:, indice[160]] = credito - credito % 100 * (estilo[:, indice[160]] == 0)
+    valores[:, indice[174]] *= -1
+
+    df = pd.DataFrame({"#DATA_BASE": np.full(linhas, yyyymm)})
+    df = pd.concat([df, base], axis=1)
+    df.insert(df.columns.get_loc("AGEN_ESPERADAS") + 1, "AGEN_PROCESSADAS", base["AGEN_ESPERADAS"])
+    verbetes = {
+        f"VERBETE_{v}_{nome}": _formatar_br(valores[:, i], estilo[:, i])
+        for i, (v, nome) in enumerate(VERBETES.items())
+    }
+    return pd.concat([df, pd.DataFrame(verbetes)], axis=1)
+
+
+def gerar_estban_csv(
+    yyyymm: str,
+    municipios: int = MUNICIPIOS_DEFAULT,
+    instituicoes: int = INSTITUICOES_DEFAULT,
+    semente: int = 0,
+    por_municipio: float = POR_MUNICIPIO_DEFAULT,
+) -> bytes:
+    """CSV mensal ESTBAN (latin-1, ';', 2 linhas de preâmbulo antes do cabeçalho)."""
+    df = gerar_estban_df(yyyymm, municipios, instituicoes, semente, por_municipio)
+    buffer = io.StringIO()
+    buffer.write("ESTATÍSTICA BANCÁRIA POR MUNICÍPIO - ESTBAN\n")
+    buffer.write(f"DATA BASE: {yyyymm[4:]}/{yyyymm[:4]}\n")
+    df.to_csv(buffer, sep=";", index=False, lineterminator="\n")
+    return buffer.getvalue().encode(ENCODING)
+
+
+def compactar(nome: str, conteudo: bytes) -> bytes:
+    """ZIP com um único membro e data fixa."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(zipfile.ZipInfo(nome, DATA_FIXA), conteudo)
+    return buffer.getvalue()
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera arquivos mensais ESTBAN sintéticos")
+    parser.add_argument("--inicio", default="2023-01", help="Primeiro mês YYYY-MM (padrão: 2023-01)")
+    parser.add_argument("--fim", default="2023-12", help="Último mês YYYY-MM (padrão: 2023-12)")
+    parser.add_argument("--municipios", type=int, default=MUNICIPIOS_DEFAULT,
+                        help=f"Municípios por mês (padrão: {MUNICIPIOS_DEFAULT})")
+    parser.add_argument("--instituicoes", type=int, default=INSTITUICOES_DEFAULT,
+                        help=f"Instituições distintas (padrão: {INSTITUICOES_DEFAULT})")
+    parser.add_argument("--por-municipio", type=float, default=POR_MUNICIPIO_DEFAULT,
+                        help=f"Média de instituições por município (padrão: {POR_MUNICIPIO_DEFAULT})")
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos dados (padrão: 0)")
+    parser.add_argument("--formato", choices=["zip", "csv"], default="zip",
+                        help="<YYYYMM>_ESTBAN.csv.zip (padrão) ou .csv sem compactação")
+    parser.add_argument("--saida", type=Path, required=True, help="Pasta de destino")
+    args = parser.parse_args()
+
+    args.saida.mkdir(parents=True, exist_ok=True)
+    total_mb = 0.0
+    linhas = 0
+    inicio = time.perf_counter()
+    for yyyymm in meses(args.inicio, args.fim):
+        csv = gerar_estban_csv(yyyymm, args.municipios, args.instituicoes, args.semente, args.por_municipio)
+        if args.formato == "zip":
+            destino = args.saida / f"{yyyymm}_ESTBAN.csv.zip"
+            destino.write_bytes(compactar(f"{yyyymm}_ESTBAN.CSV", csv))
+        else:
+            destino = args.saida / f"{yyyymm}_ESTBAN.csv"
+            destino.write_bytes(csv)
+        linhas = csv.count(b"\n") - 3
+        total_mb += destino.stat().st_size / (1024 * 1024)
+        print(f"  [OK] {destino.name} → {linhas:,} registros")
+
+    print(f"\n{len(meses(args.inicio, args.fim))} arquivos │ {linhas:,} registros/mês │ "
+          f"{total_mb:.1f} MB │ {time.perf_counter() - inicio:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+SERVIDOR LOCAL - SUBSTITUTO DO BCB PARA TESTES E BENCHMARKS
+================================================================================
+Servidor HTTP local que imita os endereços do BCB usados pelos pipelines,
+com dados sintéticos determinísticos (mesma semente → mesmos bytes):
+
+    ESTBAN     .../estatistica_bancaria_estban/municipio/<YYYYMM>_ESTBAN.csv.zip
+               (também .ZIP/.zip; .csv sem compactação), com ETag e
+               Last-Modified para o GET condicional (304)
+    Cooperados /api/servico/sitebcb/cooperadoscooperativa (JSON da API)
+               .../divulgacaoCCO/cont2/<YYYYMM>CCOCOOPERATIVA.zip
+
+Tamanho (municípios, instituições, cooperativas), latência por requisição e
+taxa de erros HTTP 503 são configuráveis. Os arquivos ESTBAN vêm de
+gerador_estban.py. Usado por bench_e2e.py; também pode rodar sozinho para
+inspeção manual.
+
+Uso:
+    python benchmarks/servidor_bcb.py --porta 8000 --latencia 0.1 --erros 0.05
+    curl -O http://127.0.0.1:8000/content/estatisticas/estatistica_bancaria_estban/municipio/202301_ESTBAN.csv.zip
+================================================================================
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from gerador_estban import INSTITUICOES_DEFAULT, MUNICIPIOS_DEFAULT, compactar, gerar_estban_csv, meses
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+
+# Caminhos imitados (os mesmos de pipeline_estban / pipeline_cooperados)
+CAMINHO_ESTBAN = "/content/estatisticas/estatistica_bancaria_estban/municipio"
+CAMINHO_COOPERADOS = "/content/estabilidadefinanceira/divulgacaoCCO/cont2"
+CAMINHO_API_COOPERADOS = "/api/servico/sitebcb/cooperadoscooperativa"
+
+# Meses publicados pela API de cooperados
+API_COOPERADOS_INICIO = "201901"
+API_COOPERADOS_FIM = "202512"
+
+# Last-Modified fixo (bytes reprodutíveis, ver gerador_estban.DATA_FIXA)
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+# ==============================================================================
+# DADOS SINTÉTICOS
+# ==============================================================================
+
+def gerar_cooperados_csv(yyyymm: str, cooperativas: int, semente: int = 0) -> bytes:
+    """CSV mensal de cooperados (6 linhas de metadados, rodapé "Fonte")."""
+    r = random.Random(semente * 1_000_003 + int(yyyymm))
+    linhas = [
+        "BANCO CENTRAL DO BRASIL", "Cooperados por cooperativa", f"Data-base: {yyyymm}",
+        "", "Documento 5300", "",
+        "CNPJ;Nome;Total de Cooperados;Cooperados PF;Cooperados PJ;"
+        "Sexo Feminino;Sexo Masculino;Sexo nao Informado",
+    ]
+    for i in range(cooperativas):
+        pf, pj = r.randint(0, 50000), r.randint(0, 3000)
+        fem = r.randint(0, pf)
+        linhas.append(f"{(i * 7919 + 13) % 99999999};COOP {i};{pf + pj};{pf};{pj};{fem};{pf - fem};0")
+    linhas.append("Fonte: Banco Central do Brasil")
+    return ("\r\n".join(linhas) + "\r\n").encode("latin-1")
+
+
+# ==============================================================================
+# SERVIDOR
+# ==============================================================================
+
+class ServidorBCB(ThreadingHTTPServer):
+    """
+    Servidor HTTP com os dados sintéticos e as estatísticas de acesso.
+
+    Os arquivos são gerados na primeira requisição e mantidos em memória.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        porta: int = 0,
+        latencia: float = 0.0,
+        erros: float = 0.0,
+        municipios: int = MUNICIPIOS_DEFAULT,
+        instituicoes: int = INSTITUICOES_DEFAULT,
+        cooperativas: int = 800,
+        semente: int = 0,
+    ):
+        super().__init__(("127.0.0.1", porta), _Handler)
+        self.latencia = latencia
+        self.erros = erros
+        self.municipios = municipios
+        self.instituicoes = instituicoes
+        self.cooperativas = cooperativas
+        self.semente = semente
+        self.estatisticas = {"requisicoes": 0, "bytes": 0, "nao_modificado": 0, "erros": 0, "nao_encontrado": 0}
+        self._arquivos = {}
+        self._csv_estban = {}
+        self._lock = threading.Lock()
+        self._sorteio = random.Random(semente)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def iniciar(self) -> "ServidorBCB":
+        """Atende em uma thread de fundo (daemon)."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def arquivo(self, caminho: str) -> Optional[bytes]:
+        """Conteúdo servido em `caminho` ou None (404)."""
+        with self._lock:
+            if caminho not in self._arquivos:
+                self._arquivos[caminho] = self._gerar(caminho)
+            return self._arquivos[caminho]
+
+    def pregerar(self, inicio: str, fim: str) -> None:
+        """Gera de antemão os arquivos dos meses YYYY-MM (fora do tempo medido)."""
+        for yyyymm in meses(inicio, fim):
+            for extensao in ["csv.zip", "csv"]:
+                self.arquivo(f"{CAMINHO_ESTBAN}/{yyyymm}_ESTBAN.{extensao}")
+            self.arquivo(f"{CAMINHO_COOPERADOS}/{yyyymm}CCOCOOPERATIVA.zip")
+
+    def sortear_erro(self) -> bool:
+        with self._lock:
+            return self._sorteio.random() < self.erros
+
+    def contar(self, chave: str, valor: int = 1) -> None:
+        with self._lock:
+            self.estatisticas[chave] += valor
+
+    def _gerar(self, caminho: str) -> Optional[bytes]:
+        if caminho == CAMINHO_API_COOPERADOS:
+            return json.dumps({"conteudo": self._api_cooperados()}).encode("utf-8")
+
+        m = re.fullmatch(re.escape(CAMINHO_ESTBAN) + r"/(\d{6})_ESTBAN\.(csv\.zip|ZIP|zip|csv)", caminho)
+        if m:
+            yyyymm, extensao = m.groups()
+            if yyyymm not in self._csv_estban:
+                self._csv_estban[yyyymm] = gerar_estban_csv(
+                    yyyymm, self.municipios, self.instituicoes, self.semente
+                )
+            csv = self._csv_estban[yyyymm]
+            return csv if extensao == "csv" else compactar(f"{yyyymm}_ESTBAN.CSV", csv)
+
+        m = re.fullmatch(re.escape(CAMINHO_COOPERADOS) + r"/(\d{6})CCOCOOPERATIVA\.zip", caminho, re.IGNORECASE)
+        if m:
+            yyyymm = m.group(1)
+            csv = gerar_cooperados_csv(yyyymm, self.cooperativas, self.semente)
+            return compactar(f"{yyyymm}CCOCOOPERATIVA.csv", csv)
+        return None
+
+    def _api_cooperados(self) -> list[dict]:
+        """Itens no formato lido por pipeline_cooperados.obter_urls_api."""
+        itens = []
+        ano, mes = int(API_COOPERADOS_INICIO[:4]), int(API_COOPERADOS_INICIO[4:])
+        while f"{ano:04d}{mes:02d}" <= API_COOPERADOS_FIM:
+            itens.append({
+                "Titulo": f"{ano:04d}/{mes:02d}",
+                "Nome": f"{ano:04d}{mes:02d}CCOCOOPERATIVA.zip",
+                "Url": f"{CAMINHO_COOPERADOS}/{ano:04d}{mes:02d}CCOCOOPERATIVA.zip",
+            })
+            mes += 1
+            if mes > 12:
+                ano, mes = ano + 1, 1
+        return itens
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ServidorBCB
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        servidor = self.server
+        servidor.contar("requisicoes")
+        if servidor.latencia:
+            time.sleep(servidor.latencia)
+
+        if servidor.sortear_erro():
+            servidor.contar("erros")
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        corpo = servidor.arquivo(self.path.split("?")[0])
+        if corpo is None:
+            servidor.contar("nao_encontrado")
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = f'"{hashlib.sha1(corpo).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            servidor.contar("nao_modificado")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        servidor.contar("bytes", len(corpo))
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local com dados sintéticos do BCB")
+    parser.add_argument("--porta", type=int, default=8000, help="Porta (padrão: 8000)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Atraso por requisição em segundos")
+    parser.add_argument("--erros", type=float, default=0.0, help="Fração de respostas 503 (0 a 1)")
+    parser.add_argument("--municipios", type=int, default=300, help="Municípios por mês no ESTBAN")
+    parser.add_argument("--instituicoes", type=int, default=40, help="Instituições no ESTBAN")
+    parser.add_argument("--cooperativas", type=int, default=800, help="Cooperativas por mês")
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos dados sintéticos")
+    args = parser.parse_args()
+
+    servidor = ServidorBCB(
+        args.porta, args.latencia, args.erros,
+        args.municipios, args.instituicoes, args.cooperativas, args.semente,
+    )
+    print(f"Servindo em {servidor.url} (Ctrl+C para parar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Estatísticas: {servidor.estatisticas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
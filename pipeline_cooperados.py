@@ -13,12 +13,37 @@
     - Remove 6 primeiras linhas de cada CSV (metadados BCB)
     - Cabeçalho único no consolidado
     - CNPJ com zeros à esquerda (8 dígitos)
-    - Coluna "Periodo" no formato DD/MM/AAAA (dia fixo = 01)
+    - Coluna "Periodo" como data YYYY-MM-DD (dia fixo = 01)
 
   Uso:
     pip install requests pandas
+    pip install pyarrow   # opcional, gera também a saída Parquet
     python pipeline_cooperados.py
 
+    Downloads concorrentes com taxa limitada (padrão: 4 simultâneos, 2/s):
+    python pipeline_cooperados.py --workers 8 --taxa 4
+
+    Os ZIPs ficam em cache (_cache/, limitado por --cache-mb) entre execuções;
+    para baixar tudo de novo:
+    python pipeline_cooperados.py --clean-cache
+
+    Para reprocessar só os meses novos ou cujo ZIP mudou (mantém os demais
+    do consolidado publicado):
+    python pipeline_cooperados.py --incremental
+
+    Para ler os CSVs em paralelo na consolidação (processos):
+    python pipeline_cooperados.py --jobs 4
+
+    Sem commit/push (só gera os arquivos):
+    python pipeline_cooperados.py --no-push
+
+    Cada execução grava métricas (latência, bytes, cache, linhas/s por
+    período e tempo de consolidação) em cooperados_metricas.json e
+    cooperados_metricas.prom; para o textfile collector do node_exporter:
+    python pipeline_cooperados.py --metricas-prom /var/lib/node_exporter/cooperados.prom
+
+  Requer bcb_comum.py na mesma pasta (utilitários compartilhados).
+
   Autor: Mazoir / assistido por Claude
   Data: 2026-02-05
 =============================================================================
@@ -27,16 +52,30 @@
 import os
 import re
 import sys
+import json
 import time
+import hashlib
 import zipfile
 import logging
+import argparse
 import subprocess
 import shutil
 import requests
 import pandas as pd
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from bcb_comum import (
+    LimitadorTaxa,
+    Medicoes,
+    criar_sessao,
+    gravar_textfile_prometheus,
+    normalizar_cnpj,
+    salvar_parquet,
+)
 
 # ============================================================================
 # CONFIGURAÇÕES
@@ -47,11 +86,19 @@ REPO_ROOT = Path(os.environ.get("GITHUB_WORKSPACE", "/workspaces/dados_publicos"
 
 # Estrutura de pastas dentro do repo
 PASTA_DADOS    = REPO_ROOT / "dados" / "bcb" / "cooperados"
-PASTA_BRUTOS   = PASTA_DADOS / "_brutos"
-PASTA_TEMP     = PASTA_DADOS / "_temp"
+PASTA_CACHE    = PASTA_DADOS / "_cache"
 
 # Arquivo consolidado final (este será versionado no Git)
 ARQUIVO_FINAL  = PASTA_DADOS / "cooperados_por_cooperativa.csv"
+ARQUIVO_PARQUET = ARQUIVO_FINAL.with_suffix(".parquet")
+
+# SHA-256 do ZIP de origem de cada período publicado (modo incremental)
+ARQUIVO_FONTES = PASTA_DADOS / "cooperados_fontes.json"
+
+# Métricas da última execução (não versionadas): JSON por período e textfile
+# do Prometheus (node_exporter); --metricas-prom grava o .prom em outro lugar
+ARQUIVO_METRICAS = PASTA_DADOS / "cooperados_metricas.json"
+ARQUIVO_PROM = ARQUIVO_METRICAS.with_suffix(".prom")
 
 # Período de coleta
 ANO_INICIO, MES_INICIO = 2020, 1
@@ -60,11 +107,32 @@ ANO_FIM, MES_FIM = 2025, 12
 # Linhas de metadados a pular no início de cada CSV bruto
 LINHAS_PULAR = 6
 
+# Colunas de contagem (inteiras) do consolidado
+COLUNAS_INT = [
+    "Total de Cooperados",
+    "Cooperados PF",
+    "Cooperados PJ",
+    "Sexo Feminino",
+    "Sexo Masculino",
+    "Sexo nao Informado",
+]
+
 # Configurações HTTP
 REQUEST_TIMEOUT = 120
 MAX_RETRIES = 3
 RETRY_DELAY = 3
-PAUSA_ENTRE_DOWNLOADS = 0.5
+
+# Downloads concorrentes: máximo em andamento e requisições por segundo
+# (a taxa substitui a antiga pausa fixa de 0,5s; ZIPs em cache só esperam se revalidados)
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_TAXA = 2.0
+
+# Meses mais recentes revalidados no BCB a cada execução (GET condicional,
+# pega republicações); os anteriores já em cache são usados sem requisição
+REVALIDAR_MESES = 6
+
+# Cache persistente dos ZIPs: tamanho máximo (remove os menos usados)
+CACHE_LIMITE_MB = 200
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/131.0.0.0 Safari/537.36",
@@ -115,7 +183,7 @@ def gerar_periodos() -> list[str]:
 
 def criar_estrutura():
     """Cria estrutura de pastas."""
-    for pasta in [PASTA_DADOS, PASTA_BRUTOS, PASTA_TEMP]:
+    for pasta in [PASTA_DADOS, PASTA_CACHE]:
         pasta.mkdir(parents=True, exist_ok=True)
     log.info(f"Estrutura criada em: {PASTA_DADOS}")
 
@@ -162,49 +230,193 @@ def url_fallback(periodo: str) -> str:
     return pattern.replace("{yyyymm}", periodo)
 
 
-def download_zip(session: requests.Session, url: str, periodo: str) -> Optional[Path]:
-    """Baixa ZIP com retry."""
-    destino = PASTA_TEMP / f"{periodo}.zip"
+def download_zip(
+    session: requests.Session,
+    url: str,
+    periodo: str,
+    limitador: Optional[LimitadorTaxa] = None,
+    etapa: Optional[dict] = None,
+    revalidar: bool = True,
+) -> Optional[Path]:
+    """
+    Baixa ZIP com retry.
+
+    Sem `revalidar`, um ZIP já em cache (e íntegro, ver cache_valido) é
+    usado direto, sem requisição. Com `revalidar`, é revalidado com GET
+    condicional (If-None-Match / If-Modified-Since): se o BCB responder 304,
+    o ZIP do cache é usado sem transferir nada; se responder 200, o mês foi
+    republicado e o ZIP é substituído. Se o BCB falhar, a cópia do cache é
+    usada como contingência. Toda requisição HTTP passa pelo `limitador`
+    (compartilhado entre as threads de download).
+
+    Se `etapa` (registro de Medicoes.etapa) for passado, recebe "cache"
+    (True se veio do cache), "ok", "bytes" baixados e "espera_s" no limitador.
+    """
+    etapa = {} if etapa is None else etapa
+    destino = PASTA_CACHE / f"{periodo}.zip"
 
-    if destino.exists() and destino.stat().st_size > 500:
+    headers = dict(HEADERS)
+    registro = cache_valido(destino)
+    if registro and not revalidar:
+        etapa.update(cache=True, ok=True, espera_s=0.0)
         return destino
-
+    if registro:
+        if registro.get("etag"):
+            headers["If-None-Match"] = registro["etag"]
+        if registro.get("last_modified"):
+            headers["If-Modified-Since"] = registro["last_modified"]
+
+    etapa.update(cache=False, ok=False, espera_s=0.0)
+    parcial = destino.with_suffix(".zip.part")
     for t in range(1, MAX_RETRIES + 1):
         try:
-            resp = session.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, stream=True)
-            if resp.status_code == 200:
-                total = 0
-                with open(destino, "wb") as f:
-                    for chunk in resp.iter_content(8192):
-                        if chunk:
-                            f.write(chunk)
-                            total += len(chunk)
-                if total > 500:
-                    log.info(f"  ✓ {periodo} │ {total:>8,} bytes")
-                    return destino
-                destino.unlink(missing_ok=True)
-            elif resp.status_code == 404:
-                log.warning(f"  ✗ {periodo} │ 404")
-                return None
-            else:
-                log.warning(f"  ✗ {periodo} │ HTTP {resp.status_code} (tentativa {t})")
+            if limitador is not None:
+                espera = time.perf_counter()
+                limitador.aguardar()
+                etapa["espera_s"] = round(etapa["espera_s"] + time.perf_counter() - espera, 4)
+            with session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as resp:
+                if resp.status_code == 304 and registro:
+                    etapa.update(cache=True, ok=True)
+                    return destino  # Não mudou desde o último download
+                if resp.status_code == 200:
+                    total = 0
+                    sha256 = hashlib.sha256()
+                    with open(parcial, "wb") as f:
+                        for chunk in resp.iter_content(8192):
+                            if chunk:
+                                f.write(chunk)
+                                sha256.update(chunk)
+                                total += len(chunk)
+                    if total > 500:
+                        parcial.replace(destino)
+                        gravar_registro_cache(destino, url, total, sha256.hexdigest(), resp.headers)
+                        etapa.update(ok=True, bytes=total)
+                        log.info(f"  ✓ {periodo} │ {total:>8,} bytes" + (" (republicado)" if registro else ""))
+                        return destino
+                    parcial.unlink(missing_ok=True)
+                elif resp.status_code == 404:
+                    log.warning(f"  ✗ {periodo} │ 404")
+                    break
+                else:
+                    log.warning(f"  ✗ {periodo} │ HTTP {resp.status_code} (tentativa {t})")
         except Exception as e:
+            parcial.unlink(missing_ok=True)
             log.warning(f"  ✗ {periodo} │ {e} (tentativa {t})")
         if t < MAX_RETRIES:
             time.sleep(RETRY_DELAY * t)
+
+    if registro:
+        log.warning(f"  ⚠ {periodo} │ BCB indisponível, usando cópia do cache")
+        etapa.update(cache=True, ok=True)
+        return destino
     return None
 
 
-def extrair_csv(zip_path: Path, periodo: str) -> Optional[Path]:
-    """Extrai CSV do ZIP."""
+# ============================================================================
+# CACHE DOS ZIPs
+# ============================================================================
+# Cada <periodo>.zip em _cache/ tem um registro <periodo>.json com URL,
+# tamanho, SHA-256 e ETag/Last-Modified (para o GET condicional). O mtime
+# do ZIP marca o último uso (ordem do LRU).
+
+def cache_valido(zip_path: Path) -> Optional[dict]:
+    """
+    Confere o ZIP em cache contra o registro (tamanho e SHA-256).
+
+    ZIP íntegro tem o último uso atualizado; ZIP sem registro ou divergente
+    é removido para ser baixado novamente.
+
+    Returns:
+        Registro do ZIP, ou None se ausente/inválido
+    """
+    if not zip_path.exists():
+        return None
+
+    registro = zip_path.with_suffix(".json")
+    try:
+        meta = json.loads(registro.read_text(encoding="utf-8"))
+        valido = (
+            zip_path.stat().st_size == meta["bytes"]
+            and hashlib.sha256(zip_path.read_bytes()).hexdigest() == meta["sha256"]
+        )
+    except (OSError, ValueError, KeyError):
+        valido = False
+
+    if not valido:
+        log.warning(f"  ⚠ {zip_path.stem} │ cache inválido, baixando novamente")
+        zip_path.unlink(missing_ok=True)
+        registro.unlink(missing_ok=True)
+        return None
+
+    os.utime(zip_path)
+    return meta
+
+
+def gravar_registro_cache(zip_path: Path, url: str, total: int, sha256: str, headers):
+    """Grava o registro (URL, tamanho, SHA-256, ETag/Last-Modified) de um ZIP recém-baixado."""
+    registro = {
+        "url": url,
+        "bytes": total,
+        "sha256": sha256,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "baixado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    zip_path.with_suffix(".json").write_text(json.dumps(registro, indent=2), encoding="utf-8")
+
+
+def sha256_registrado(zip_path: Path) -> str:
+    """
+    SHA-256 do ZIP em cache, lido do registro (já conferido por cache_valido
+    ou gravado no download). Sem registro, calcula lendo o ZIP em blocos.
+    """
+    try:
+        return json.loads(zip_path.with_suffix(".json").read_text(encoding="utf-8"))["sha256"]
+    except (OSError, ValueError, KeyError):
+        sha256 = hashlib.sha256()
+        with open(zip_path, "rb") as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(bloco)
+        return sha256.hexdigest()
+
+
+def limitar_cache(limite_mb: float):
+    """Remove os ZIPs usados há mais tempo até o cache caber em `limite_mb`."""
+    zips = sorted(PASTA_CACHE.glob("*.zip"), key=lambda z: z.stat().st_mtime)
+    total = sum(z.stat().st_size for z in zips)
+    limite = limite_mb * 1024 * 1024
+
+    removidos = 0
+    while zips and total > limite:
+        antigo = zips.pop(0)
+        total -= antigo.stat().st_size
+        antigo.unlink()
+        antigo.with_suffix(".json").unlink(missing_ok=True)
+        removidos += 1
+
+    log.info(
+        f"✓ Cache: {len(zips)} ZIPs │ {total / (1024 * 1024):.1f} MB"
+        + (f" │ {removidos} removido(s) (limite {limite_mb:g} MB)" if removidos else "")
+    )
+
+
+def limpar_cache():
+    """Apaga todo o cache de ZIPs (--clean-cache)."""
+    shutil.rmtree(PASTA_CACHE, ignore_errors=True)
+    log.info("✓ Cache de ZIPs apagado")
+
+
+def localizar_csv(zip_path: Path, periodo: str) -> Optional[str]:
+    """
+    Nome do CSV dentro do ZIP (lê só o diretório central, sem descompactar).
+
+    O CSV é lido depois direto do ZIP em consolidar().
+    """
     try:
         with zipfile.ZipFile(zip_path, "r") as zf:
             for nome in zf.namelist():
                 if nome.lower().endswith(".csv"):
-                    dest = PASTA_BRUTOS / f"{periodo}.csv"
-                    with zf.open(nome) as src, open(dest, "wb") as tgt:
-                        tgt.write(src.read())
-                    return dest
+                    return nome
     except zipfile.BadZipFile:
         log.error(f"  ✗ ZIP corrompido: {periodo}")
     return None
@@ -214,138 +426,294 @@ def extrair_csv(zip_path: Path, periodo: str) -> Optional[Path]:
 # ETAPA 2: CONSOLIDAÇÃO
 # ============================================================================
 
-def consolidar() -> bool:
+def ler_fontes() -> dict[str, str]:
+    """Lê o SHA-256 do ZIP de cada período publicado ({YYYYMM: sha256})."""
+    try:
+        return json.loads(ARQUIVO_FONTES.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def gravar_fontes(fontes: dict[str, str]):
+    """Grava o SHA-256 dos ZIPs junto ao consolidado."""
+    ARQUIVO_FONTES.write_text(
+        json.dumps(dict(sorted(fontes.items())), indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
+def ler_consolidado() -> Optional[pd.DataFrame]:
+    """Lê o consolidado publicado (mesmo formato gravado por consolidar)."""
+    if not ARQUIVO_FINAL.exists():
+        return None
+    try:
+        return pd.read_csv(
+            ARQUIVO_FINAL,
+            sep=";",
+            encoding="utf-8",
+            dtype={"CNPJ": str, **{col: "Int32" for col in COLUNAS_INT}},
+            parse_dates=["Periodo"],
+            keep_default_na=False,
+        )
+    except Exception as e:
+        log.warning(f"  ⚠ Falha ao ler consolidado existente: {e}")
+        return None
+
+
+def ler_csv_zip(zip_path: Path, membro: str) -> pd.DataFrame:
+    """
+    Lê o CSV direto do ZIP, já tipado: contagens em Int32, demais em texto.
+
+    A coluna Nome não é lida (não vai para o consolidado) e o rodapé BCB
+    é removido. As contagens passam pelo parser numérico em C (float64,
+    com o rodapé como NaN) e viram Int32 após remover o rodapé.
+
+    Se alguma contagem vier fora do padrão numérico, relê o arquivo como
+    texto e converte descartando os valores inválidos (como antes).
+    """
+    def _ler(dtype, na_values=None) -> pd.DataFrame:
+        with zipfile.ZipFile(zip_path, "r") as zf, zf.open(membro) as csv_stream:
+            df = pd.read_csv(
+                csv_stream,
+                skiprows=LINHAS_PULAR,
+                sep=";",
+                encoding="latin-1",
+                dtype=dtype,
+                usecols=lambda col: col != "Nome",
+                on_bad_lines="warn",
+                keep_default_na=False,
+                na_values=na_values,
+            )
+        return remover_rodape(df)
+
+    try:
+        df = _ler(
+            defaultdict(lambda: str, {col: "float64" for col in COLUNAS_INT}),
+            na_values={col: [""] for col in COLUNAS_INT},
+        )
+        for col in COLUNAS_INT:
+            if col in df.columns:
+                df[col] = df[col].astype("Int32")
+    except (ValueError, TypeError):
+        df = _ler(str)
+        for col in COLUNAS_INT:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int).astype("Int32")
+    return df
+
+
+def remover_rodape(df: pd.DataFrame) -> pd.DataFrame:
+    """Remove o rodapé BCB ("Fonte: Banco Central..."), se existir."""
+    if df.empty:
+        return df
+    val_ultima = str(list(df.iloc[-1])[0]).lower()
+    if "fonte" in val_ultima or "banco central" in val_ultima:
+        return df.iloc[:-1]
+    return df
+
+
+def coluna_cnpj(colunas) -> Optional[str]:
+    """Nome da coluna de CNPJ no CSV do BCB (None se não houver)."""
+    for c in colunas:
+        if "cnpj" in c.strip().lower():
+            return c
+    return None
+
+
+def ler_periodo(
+    periodo: str,
+    zip_path: Path,
+    membro: str,
+) -> tuple[Optional[pd.DataFrame], Optional[str], list[dict]]:
+    """
+    Lê e prepara o CSV de um mês: leitura tipada, CNPJ com 8 dígitos e Periodo.
+
+    Função de nível de módulo e sem log, para rodar em processos separados
+    (ProcessPoolExecutor) na consolidação. A medição da leitura volta junto
+    com o resultado. O único estado global é o memo de normalizar_cnpj
+    (bcb_comum), que cresce a cada mês lido no mesmo processo mas não muda
+    o resultado; cada processo do pool tem o seu.
+
+    Returns:
+        (DataFrame, None, etapas) ou (None, motivo, etapas), com motivo
+        "vazio" ou a mensagem do erro e etapas = Medicoes.etapas ("leitura")
+    """
+    medicoes = Medicoes()
+    try:
+        with medicoes.etapa("leitura", periodo) as etapa:
+            etapa["bytes"] = zip_path.stat().st_size
+            df = ler_csv_zip(zip_path, membro)
+            etapa["linhas"] = len(df)
+    except Exception as e:
+        return None, str(e), medicoes.etapas
+
+    if df.empty:
+        return None, "vazio", medicoes.etapas
+
+    # CNPJ: zeros à esquerda (8 dígitos), normalizando só os valores distintos
+    col_cnpj = coluna_cnpj(df.columns)
+    if col_cnpj:
+        df[col_cnpj] = normalizar_cnpj(df[col_cnpj])
+
+    # Coluna Periodo: data constante do arquivo, já tipada
+    df["Periodo"] = pd.Timestamp(int(periodo[:4]), int(periodo[4:6]), 1)
+    return df, None, medicoes.etapas
+
+
+def consolidar(
+    arquivos: dict[str, tuple[Path, str]],
+    incremental: bool = False,
+    jobs: int = 1,
+    medicoes: Optional[Medicoes] = None,
+) -> bool:
     """
     Consolida CSVs individuais em arquivo único.
 
+    Cada CSV é lido em streaming direto do ZIP em cache, sem extração
+    para disco.
+
+    Com `incremental`, os períodos já publicados cujo ZIP tem o mesmo
+    SHA-256 registrado em ARQUIVO_FONTES são mantidos do consolidado
+    existente; só os meses novos ou alterados são lidos.
+
+    Args:
+        arquivos: {periodo "YYYYMM": (caminho do ZIP, nome do CSV no ZIP)}
+        incremental: Reaproveita os períodos inalterados do consolidado
+        jobs: Processos para ler os arquivos em paralelo (1 = no processo atual)
+        medicoes: Recebe as etapas de leitura (por período) e de gravação
+
     Regras:
       - Pula 6 primeiras linhas (metadados BCB)
       - Cabeçalho único
       - CNPJ: zfill(8)
-      - Coluna Periodo: DD/MM/AAAA
+      - Contagens: Int32 na leitura (vazio → 0)
+      - Coluna Periodo: data do arquivo (YYYY-MM-DD no CSV)
     """
     log.info("")
     log.info("═" * 60)
     log.info("CONSOLIDAÇÃO")
     log.info("═" * 60)
 
-    csvs = sorted(PASTA_BRUTOS.glob("*.csv"))
-    if not csvs:
+    if not arquivos:
         log.error("Nenhum CSV encontrado!")
         return False
 
-    log.info(f"Arquivos: {len(csvs)}")
+    log.info(f"Arquivos: {len(arquivos)}")
+
+    medicoes = medicoes or Medicoes()
+    fontes = ler_fontes()
+    existente = ler_consolidado() if incremental else None
+    publicados = set()
+    if existente is not None:
+        chaves = existente["Periodo"].dt.strftime("%Y%m")
+        publicados = set(chaves.unique())
+        log.info(f"  Consolidado existente: {len(existente):,} linhas │ {len(publicados)} períodos")
 
     dfs = []
-    col_cnpj = None
+    processados = set()
+    inalterados = 0
+    tarefas = []
+
+    for periodo, (zip_path, membro) in sorted(arquivos.items()):
+        # Período sem hash registrado conta como alterado
+        sha256 = sha256_registrado(zip_path)
+        if periodo in publicados and fontes.get(periodo) == sha256:
+            inalterados += 1
+            continue
+        tarefas.append((periodo, zip_path, membro, sha256))
+
+    # Leitura por arquivo (em `jobs` processos); resultados na ordem dos períodos
+    argumentos = [t[:3] for t in tarefas]
+    if jobs > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            resultados = list(pool.map(ler_periodo, *zip(*argumentos)))
+    else:
+        resultados = [ler_periodo(*args) for args in argumentos]
 
-    for csv_path in csvs:
-        periodo = csv_path.stem  # "202001", "202002", ...
-        ano = periodo[:4]
-        mes = periodo[4:6]
-        periodo_fmt = f"01/{mes}/{ano}"
+    for (periodo, _, _, sha256), (df, erro, etapas) in zip(tarefas, resultados):
+        medicoes.adicionar(etapas)
+        if df is None:
+            if erro == "vazio":
+                log.warning(f"  ⚠ {periodo} vazio")
+            else:
+                log.error(f"  ✗ {periodo} │ {erro}")
+            continue
 
-        try:
-            df = pd.read_csv(
-                csv_path,
-                skiprows=LINHAS_PULAR,
-                sep=";",
-                encoding="latin-1",
-                dtype=str,
-                on_bad_lines="warn",
-                keep_default_na=False,
-            )
+        if not dfs:
+            col_cnpj = coluna_cnpj(df.columns)
+            if col_cnpj:
+                log.info(f"  Coluna CNPJ: '{col_cnpj}'")
+                log.info(f"  Colunas: {list(df.columns)}")
 
-            if df.empty:
-                log.warning(f"  ⚠ {periodo} vazio")
-                continue
-
-            # Remove rodapé BCB (se existir)
-            val_ultima = str(list(df.iloc[-1])[0]).lower()
-            if "fonte" in val_ultima or "banco central" in val_ultima:
-                df = df.iloc[:-1]
-
-            # Detecta coluna CNPJ (primeira vez)
-            if col_cnpj is None:
-                for c in df.columns:
-                    if "cnpj" in c.strip().lower():
-                        col_cnpj = c
-                        break
-                if col_cnpj:
-                    log.info(f"  Coluna CNPJ: '{col_cnpj}'")
-                    log.info(f"  Colunas: {list(df.columns)}")
-
-            # CNPJ: zeros à esquerda (8 dígitos)
-            if col_cnpj and col_cnpj in df.columns:
-                df[col_cnpj] = (
-                    df[col_cnpj].astype(str).str.strip()
-                    .str.replace(r"\D", "", regex=True)
-                    .str.zfill(8)
-                )
-
-            # Coluna Periodo
-            df["Periodo"] = periodo_fmt
-
-            dfs.append(df)
-            log.info(f"  ✓ {periodo} │ {len(df):>6,} linhas │ {periodo_fmt}")
+        dfs.append(df)
+        processados.add(periodo)
+        fontes[periodo] = sha256
+        log.info(f"  ✓ {periodo} │ {len(df):>6,} linhas │ 01/{periodo[4:6]}/{periodo[:4]}")
 
-        except Exception as e:
-            log.error(f"  ✗ {periodo} │ {e}")
+    if inalterados:
+        log.info(f"  = {inalterados} período(s) sem alteração, mantidos do consolidado")
 
     if not dfs:
+        if inalterados:
+            log.info("Nenhum período novo ou alterado. Consolidado já está atualizado.")
+            return True
         log.error("Nenhum DataFrame gerado!")
         return False
 
     # Concatena
     log.info(f"\nConcatenando {len(dfs)} períodos...")
-    df_final = pd.concat(dfs, ignore_index=True)
+    with medicoes.etapa("concat") as etapa:
+        df_final = pd.concat(dfs, ignore_index=True)
+        etapa["linhas"] = len(df_final)
 
     # ── Transformações pós-concatenação ──────────────────────────
 
-    # 1. Remove coluna Nome
-    if "Nome" in df_final.columns:
-        df_final.drop(columns=["Nome"], inplace=True)
-        log.info("  ✓ Coluna 'Nome' removida")
-
-    # 2. Colunas numéricas → inteiro
-    colunas_int = [
-        "Total de Cooperados",
-        "Cooperados PF",
-        "Cooperados PJ",
-        "Sexo Feminino",
-        "Sexo Masculino",
-        "Sexo nao Informado",
-    ]
-    for col in colunas_int:
+    # 1. Coluna Nome: não é lida (ver ler_csv_zip)
+
+    # 2. Colunas numéricas (lidas como Int32): vazio → 0
+    for col in COLUNAS_INT:
         if col in df_final.columns:
-            df_final[col] = (
-                pd.to_numeric(df_final[col], errors="coerce")
-                .fillna(0)
-                .astype(int)
-            )
-    log.info(f"  ✓ Colunas numéricas convertidas para inteiro: {colunas_int}")
+            df_final[col] = df_final[col].fillna(0)
+    log.info(f"  ✓ Colunas numéricas lidas como inteiro: {COLUNAS_INT}")
 
-    # 3. Periodo → data (YYYY-MM-DD no CSV, o Power BI reconhece direto)
-    if "Periodo" in df_final.columns:
-        df_final["Periodo"] = pd.to_datetime(
-            df_final["Periodo"], format="%d/%m/%Y"
-        ).dt.strftime("%Y-%m-%d")
-        log.info("  ✓ Coluna 'Periodo' convertida para data (YYYY-MM-DD)")
+    # 3. Incremental: junta aos períodos mantidos do consolidado existente
+    if existente is not None:
+        mantidos = existente[~chaves.isin(processados)]
+        log.info(f"  ✓ Períodos reprocessados: {len(processados)} │ mantidos: {len(publicados - processados)}")
+        df_final = pd.concat([mantidos, df_final], ignore_index=True)
+        df_final = df_final.sort_values("Periodo", kind="stable", ignore_index=True)
+        del existente
 
     # Salva
     log.info(f"Salvando: {ARQUIVO_FINAL}")
-    df_final.to_csv(ARQUIVO_FINAL, index=False, sep=";", encoding="utf-8")
+    # Periodo como YYYY-MM-DD no CSV (o Power BI reconhece direto)
+    with medicoes.etapa("csv") as etapa:
+        df_final.to_csv(ARQUIVO_FINAL, index=False, sep=";", encoding="utf-8", date_format="%Y-%m-%d")
+        etapa.update(linhas=len(df_final), bytes=ARQUIVO_FINAL.stat().st_size)
+    gravar_fontes(fontes)
 
     tam_mb = ARQUIVO_FINAL.stat().st_size / (1024 * 1024)
 
+    # Parquet tipado (CNPJ com dicionário, Periodo date32, contagens int32)
+    with medicoes.etapa("parquet") as etapa:
+        parquet_ok = salvar_parquet(
+            df_final, ARQUIVO_PARQUET, texto=("CNPJ",), datas=("Periodo",), inteiros=tuple(COLUNAS_INT)
+        )
+        if parquet_ok:
+            etapa.update(linhas=len(df_final), bytes=ARQUIVO_PARQUET.stat().st_size)
+    if parquet_ok:
+        log.info(f"  ✓ Parquet: {ARQUIVO_PARQUET.name} ({ARQUIVO_PARQUET.stat().st_size / 1024:.0f} KB)")
+    else:
+        log.warning("  ⚠ pyarrow não instalado, Parquet não gerado (pip install pyarrow)")
+
     log.info("")
     log.info("─" * 60)
     log.info(f"  Arquivo:    {ARQUIVO_FINAL.name}")
     log.info(f"  Tamanho:    {tam_mb:.2f} MB")
     log.info(f"  Linhas:     {len(df_final):,}")
     log.info(f"  Colunas:    {list(df_final.columns)}")
-    periodos = sorted(df_final["Periodo"].unique(), key=lambda x: x[6:10] + x[3:5])
-    log.info(f"  Períodos:   {len(periodos)} ({periodos[0]} → {periodos[-1]})")
+    periodos = sorted(df_final["Periodo"].unique())
+    log.info(f"  Períodos:   {len(periodos)} ({periodos[0]:%Y-%m-%d} → {periodos[-1]:%Y-%m-%d})")
     log.info("─" * 60)
 
     # Amostra
@@ -366,6 +734,10 @@ def criar_gitignore():
         "# Arquivos temporários do pipeline\n"
         "_brutos/\n"
         "_temp/\n"
+        "_cache/\n"
+        "# Métricas da última execução\n"
+        "cooperados_metricas.json\n"
+        "cooperados_metricas.prom\n"
     )
 
 
@@ -384,6 +756,10 @@ def git_push():
 
     # Add apenas os arquivos relevantes
     run_git("add", str(ARQUIVO_FINAL))
+    if ARQUIVO_PARQUET.exists():
+        run_git("add", str(ARQUIVO_PARQUET))
+    if ARQUIVO_FONTES.exists():
+        run_git("add", str(ARQUIVO_FONTES))
     run_git("add", str(PASTA_DADOS / ".gitignore"))
     run_git("add", str(REPO_ROOT / "README.md"))
 
@@ -433,6 +809,7 @@ Repositório de dados públicos consolidados do Banco Central do Brasil, prontos
 - **Período:** 01/2020 a 12/2025 (72 meses)
 - **Separador:** `;`
 - **Encoding:** `UTF-8`
+- **Parquet:** `dados/bcb/cooperados/cooperados_por_cooperativa.parquet` (tipado)
 
 **Colunas adicionadas:**
 | Coluna | Descrição |
@@ -482,6 +859,25 @@ Execute no Codespace:
 ```bash
 pip install requests pandas
 python pipeline_cooperados.py
+
+# Opções: downloads simultâneos e requisições por segundo ao BCB
+python pipeline_cooperados.py --workers 8 --taxa 4
+
+# Os ZIPs ficam em cache (_cache/, até --cache-mb) entre execuções;
+# para baixar tudo de novo:
+python pipeline_cooperados.py --clean-cache
+
+# Só os meses novos ou cujo ZIP mudou (mantém os demais do consolidado)
+python pipeline_cooperados.py --incremental
+
+# Lê os CSVs em paralelo na consolidação (processos)
+python pipeline_cooperados.py --jobs 4
+
+# Sem commit/push (só gera os arquivos)
+python pipeline_cooperados.py --no-push
+
+# Métricas por período (cooperados_metricas.json / .prom); .prom para o node_exporter
+python pipeline_cooperados.py --metricas-prom /var/lib/node_exporter/cooperados.prom
 ```
 
 ## Última atualização
@@ -494,12 +890,187 @@ python pipeline_cooperados.py
     log.info("✓ README.md atualizado")
 
 
+# ============================================================================
+# MÉTRICAS
+# ============================================================================
+# ARQUIVO_METRICAS (JSON): etapas por período e totais, para acompanhar a
+# vazão ao longo dos meses. ARQUIVO_PROM: as mesmas medidas como gauges do
+# Prometheus, para o agendador alertar sobre regressões.
+
+def gravar_metricas(medicoes: Medicoes, status: str, caminho_prom: Path, **extras):
+    """
+    Grava as métricas da execução em JSON e no textfile do Prometheus.
+
+    Por período: latência do download (e espera no limitador), bytes
+    baixados, cache hit/miss, linhas lidas e linhas/s da leitura. Totais:
+    tempo por etapa (inclusive "consolidacao"), duração e sucesso.
+
+    Falhas de gravação só geram aviso (não mudam o resultado do pipeline).
+    """
+    periodos = medicoes.por_periodo()
+    vazao = {
+        periodo: round(etapas["leitura"]["linhas"] / etapas["leitura"]["segundos"])
+        for periodo, etapas in periodos.items()
+        if "leitura" in etapas and etapas["leitura"]["segundos"] > 0
+    }
+    try:
+        relatorio = medicoes.gravar(
+            ARQUIVO_METRICAS, pipeline="cooperados", status=status, leitura_linhas_por_s=vazao, **extras
+        )
+    except OSError as e:
+        log.warning(f"  ⚠ Falha ao gravar métricas: {e}")
+        return
+
+    downloads = {p: e["download"] for p, e in periodos.items() if "download" in e}
+    leituras = {p: e["leitura"] for p, e in periodos.items() if "leitura" in e}
+    resumo = relatorio["resumo"]
+
+    def _por_periodo(registros: dict, campo: str) -> list:
+        return [({"periodo": p}, r[campo]) for p, r in registros.items() if campo in r]
+
+    prefixo = "bcb_cooperados"
+    metricas = [
+        (f"{prefixo}_download_seconds", "Latência do download do ZIP por período (inclui espera do limitador)",
+         _por_periodo(downloads, "segundos")),
+        (f"{prefixo}_download_espera_seconds", "Espera no limitador de taxa por período",
+         _por_periodo(downloads, "espera_s")),
+        (f"{prefixo}_download_bytes", "Bytes baixados por período (0 se veio do cache)",
+         _por_periodo(downloads, "bytes")),
+        (f"{prefixo}_download_cache_hit", "1 se o ZIP do período veio do cache local, 0 se foi baixado",
+         _por_periodo(downloads, "cache")),
+        (f"{prefixo}_download_ok", "1 se o ZIP do período está disponível",
+         _por_periodo(downloads, "ok")),
+        (f"{prefixo}_leitura_linhas", "Linhas lidas do CSV por período",
+         _por_periodo(leituras, "linhas")),
+        (f"{prefixo}_leitura_linhas_por_segundo", "Vazão da leitura do CSV por período",
+         [({"periodo": p}, v) for p, v in vazao.items()]),
+        (f"{prefixo}_etapa_seconds", "Duração total por etapa (soma dos períodos)",
+         [({"etapa": nome}, etapa["segundos"]) for nome, etapa in resumo.items()]),
+        (f"{prefixo}_consolidacao_seconds", "Duração da consolidação",
+         [({}, resumo["consolidacao"]["segundos"])] if "consolidacao" in resumo else []),
+        (f"{prefixo}_duracao_seconds", "Duração total da execução",
+         [({}, relatorio["duracao_s"])]),
+        (f"{prefixo}_rss_pico_megabytes", "Pico de memória residente do processo principal",
+         [({}, relatorio["rss_pico_mb"])] if relatorio["rss_pico_mb"] is not None else []),
+        (f"{prefixo}_sucesso", "1 se a última execução terminou com sucesso",
+         [({}, status == "ok")]),
+        (f"{prefixo}_ultima_execucao_timestamp_seconds", "Fim da última execução (Unix)",
+         [({}, round(time.time()))]),
+    ]
+    try:
+        gravar_textfile_prometheus(caminho_prom, metricas)
+    except OSError as e:
+        log.warning(f"  ⚠ Falha ao gravar métricas Prometheus: {e}")
+        return
+    log.info(f"✓ Métricas: {ARQUIVO_METRICAS.name} │ {caminho_prom}")
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
+def baixar_todos(
+    session: requests.Session,
+    periodos: list[str],
+    urls_api: dict[str, str],
+    workers: int = DOWNLOAD_WORKERS,
+    taxa: float = DOWNLOAD_TAXA,
+    medicoes: Optional[Medicoes] = None,
+    revalidar_meses: int = REVALIDAR_MESES,
+) -> list[Optional[Path]]:
+    """
+    Baixa os ZIPs de todos os períodos em paralelo, respeitando a taxa.
+
+    Até `workers` downloads ficam em andamento, e novas requisições saem a
+    no máximo `taxa` por segundo (LimitadorTaxa). Só os `revalidar_meses`
+    períodos mais recentes já em cache são revalidados (GET condicional);
+    os demais saem do cache sem requisição, então uma execução com o cache
+    completo faz no máximo `revalidar_meses` requisições. Cada download é
+    registrado em `medicoes` como etapa "download" do período (ver
+    download_zip).
+
+    Returns:
+        Caminhos dos ZIPs (None nos que falharam), na ordem de `periodos`
+    """
+    limitador = LimitadorTaxa(taxa)
+    medicoes = medicoes or Medicoes()
+    recentes = set(sorted(periodos)[-revalidar_meses:]) if revalidar_meses > 0 else set()
+
+    def _baixar(periodo: str) -> Optional[Path]:
+        with medicoes.etapa("download", periodo) as etapa:
+            return download_zip(
+                session, urls_api.get(periodo, url_fallback(periodo)), periodo, limitador, etapa,
+                revalidar=periodo in recentes,
+            )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_baixar, periodos))
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Pipeline BCB - Cooperados por Cooperativa")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help=f"Downloads simultâneos (padrão: {DOWNLOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--taxa",
+        type=float,
+        default=DOWNLOAD_TAXA,
+        help=f"Máximo de requisições por segundo ao BCB, 0 = sem limite (padrão: {DOWNLOAD_TAXA:g})",
+    )
+    parser.add_argument(
+        "--revalidar-meses",
+        type=int,
+        default=REVALIDAR_MESES,
+        help=f"Meses mais recentes em cache revalidados no BCB, 0 = nenhum (padrão: {REVALIDAR_MESES})",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=CACHE_LIMITE_MB,
+        help=f"Tamanho máximo do cache de ZIPs em MB (padrão: {CACHE_LIMITE_MB})",
+    )
+    parser.add_argument(
+        "--no-push",
+        action="store_true",
+        help="Não fazer git commit/push (só gera os arquivos)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Processos para ler os CSVs na consolidação (padrão: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reprocessa só os meses novos ou cujo ZIP mudou desde a última publicação",
+    )
+    parser.add_argument(
+        "--clean-cache",
+        action="store_true",
+        help="Apaga o cache de ZIPs antes de começar (baixa tudo de novo)",
+    )
+    parser.add_argument(
+        "--metricas-prom",
+        type=Path,
+        default=ARQUIVO_PROM,
+        help="Arquivo .prom das métricas (ex.: pasta do textfile collector do node_exporter; "
+             f"padrão: {ARQUIVO_PROM.name} junto ao consolidado)",
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error(f"--workers deve ser >= 1: {args.workers}")
+    if args.jobs < 1:
+        parser.error(f"--jobs deve ser >= 1: {args.jobs}")
+    if args.revalidar_meses < 0:
+        parser.error(f"--revalidar-meses deve ser >= 0: {args.revalidar_meses}")
+
     inicio = time.time()
+    medicoes = Medicoes()
 
     print()
     print("╔" + "═" * 68 + "╗")
@@ -509,59 +1080,83 @@ def main():
     print("╚" + "═" * 68 + "╝")
     print()
 
-    # ── Preparação ────────────────────────────────────────────────
-    criar_estrutura()
+    # Métricas são gravadas também quando uma exceção interrompe a execução
+    ok = False
+    sucesso, falha = 0, 0
+    extras = {}
+    try:
+        # ── Preparação ────────────────────────────────────────────
+        if args.clean_cache:
+            limpar_cache()
+        criar_estrutura()
 
-    # ── Sessão HTTP ───────────────────────────────────────────────
-    session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(
-        max_retries=requests.urllib3.util.retry.Retry(
-            total=2, backoff_factor=1, status_forcelist=[500, 502, 503, 504]
-        )
-    )
-    session.mount("https://", adapter)
+        # ── Sessão HTTP ───────────────────────────────────────────
+        # Sem retry no urllib3: toda tentativa passa pelo LimitadorTaxa de download_zip
+        session = criar_sessao(args.workers, retries=0)
 
-    # ── ETAPA 1: Download ─────────────────────────────────────────
-    periodos = gerar_periodos()
-    urls_api = obter_urls_api(session)
+        # ── ETAPA 1: Download ─────────────────────────────────────
+        periodos = gerar_periodos()
+        with medicoes.etapa("api"):
+            urls_api = obter_urls_api(session)
 
-    log.info("")
-    log.info("═" * 60)
-    log.info(f"DOWNLOAD ({len(periodos)} períodos)")
-    log.info("═" * 60)
+        log.info("")
+        log.info("═" * 60)
+        log.info(f"DOWNLOAD ({len(periodos)} períodos)")
+        log.info("═" * 60)
 
-    sucesso, falha = 0, 0
+        arquivos = {}
 
-    for periodo in periodos:
-        url = urls_api.get(periodo, url_fallback(periodo))
-        zip_path = download_zip(session, url, periodo)
+        zips = baixar_todos(
+            session, periodos, urls_api, args.workers, args.taxa, medicoes, args.revalidar_meses
+        )
 
-        if zip_path:
-            csv_path = extrair_csv(zip_path, periodo)
-            if csv_path:
+        for periodo, zip_path in zip(periodos, zips):
+            membro = localizar_csv(zip_path, periodo) if zip_path else None
+            if membro:
+                arquivos[periodo] = (zip_path, membro)
                 sucesso += 1
             else:
                 falha += 1
-        else:
-            falha += 1
-
-        time.sleep(PAUSA_ENTRE_DOWNLOADS)
 
-    log.info(f"\nDownload: {sucesso} OK │ {falha} falha(s)")
+        log.info(f"\nDownload: {sucesso} OK │ {falha} falha(s)")
 
-    # ── ETAPA 2: Consolidação ─────────────────────────────────────
-    consolidacao_ok = consolidar()
+        # ── ETAPA 2: Consolidação ─────────────────────────────────
+        with medicoes.etapa("consolidacao"):
+            consolidacao_ok = consolidar(arquivos, args.incremental, args.jobs, medicoes)
 
-    # ── ETAPA 3: Git Push ─────────────────────────────────────────
-    push_ok = False
-    if consolidacao_ok:
-        atualizar_readme()
-        push_ok = git_push()
-
-    # ── Limpeza ───────────────────────────────────────────────────
-    shutil.rmtree(PASTA_BRUTOS, ignore_errors=True)
-    shutil.rmtree(PASTA_TEMP, ignore_errors=True)
-    log.info("\n✓ Temporários removidos")
+        # ── ETAPA 3: Git Push ─────────────────────────────────────
+        push_ok = False
+        if consolidacao_ok:
+            with medicoes.etapa("readme"):
+                atualizar_readme()
+            if args.no_push:
+                log.info("Git push desabilitado (--no-push)")
+            else:
+                with medicoes.etapa("git"):
+                    push_ok = git_push()
+
+        # ── Cache ─────────────────────────────────────────────────
+        limitar_cache(args.cache_mb)
+
+        ok = consolidacao_ok and (push_ok or args.no_push)
+    except BaseException as e:
+        extras["erro"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        # ── Métricas ──────────────────────────────────────────────
+        gravar_metricas(
+            medicoes,
+            "ok" if ok else "falha",
+            args.metricas_prom,
+            parametros={
+                "inicio": f"{ANO_INICIO}{MES_INICIO:02d}", "fim": f"{ANO_FIM}{MES_FIM:02d}",
+                "workers": args.workers, "taxa": args.taxa, "jobs": args.jobs,
+                "revalidar_meses": args.revalidar_meses,
+                "incremental": args.incremental, "push": not args.no_push,
+            },
+            downloads={"ok": sucesso, "falha": falha},
+            **extras,
+        )
 
     # ── Relatório ─────────────────────────────────────────────────
     duracao = time.time() - inicio
@@ -572,7 +1167,10 @@ def main():
     print("╠" + "═" * 68 + "╣")
     print(f"║  Downloads:       {sucesso:>3} OK │ {falha} falha(s)" + " " * (38 - len(str(falha))) + "║")
     print(f"║  Consolidação:    {'✓ OK' if consolidacao_ok else '✗ FALHOU'}" + " " * (50 if consolidacao_ok else 47) + "║")
-    print(f"║  Git Push:        {'✓ OK' if push_ok else '✗ FALHOU'}" + " " * (50 if push_ok else 47) + "║")
+    if args.no_push:
+        print("║  Git Push:        desabilitado (--no-push)" + " " * 25 + "║")
+    else:
+        print(f"║  Git Push:        {'✓ OK' if push_ok else '✗ FALHOU'}" + " " * (50 if push_ok else 47) + "║")
 
     if ARQUIVO_FINAL.exists():
         tam = ARQUIVO_FINAL.stat().st_size / (1024 * 1024)
@@ -592,7 +1190,7 @@ def main():
             print(f"\n  📎 URL raw para Power BI:")
             print(f"  {raw_url}\n")
 
-    return 0 if (consolidacao_ok and push_ok) else 1
+    return 0 if ok else 1
 
 
 if __name__ == "__main__":
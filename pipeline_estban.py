@@ -37,6 +37,8 @@ Verbetes Estratégicos:
 
 Requisitos:
     pip install pandas requests tqdm
+    pip install pyarrow  (opcional, gera também a saída Parquet)
+    bcb_comum.py na mesma pasta (utilitários compartilhados)
 
 Uso:
     python pipeline_estban.py
@@ -46,6 +48,30 @@ Uso:
 
     Para definir período customizado:
     python pipeline_estban.py --inicio 2024-01 --fim 2025-09
+
+    Para ajustar o número de downloads simultâneos:
+    python pipeline_estban.py --workers 8
+
+    Para ignorar o cache local de arquivos brutos:
+    python pipeline_estban.py --no-cache
+
+    Para processar apenas meses novos ou alterados:
+    python pipeline_estban.py --incremental
+
+    Para extrair/transformar os meses em 4 processos (CPU):
+    python pipeline_estban.py --jobs 4
+
+    Para gerar também a saída particionada por mês (periodo=YYYYMM/):
+    python pipeline_estban.py --particionado
+
+    Para ajustar a compressão do .csv.gz (nível 1-9 e threads):
+    python pipeline_estban.py --gzip-nivel 9 --gzip-threads 4
+
+    Para cargas históricas longas (memória constante, grava mês a mês):
+    python pipeline_estban.py --inicio 1988-07 --fim 2025-09 --streaming
+
+    Para reduzir ainda mais a memória (KPIs em float32):
+    python pipeline_estban.py --kpi-float32
 ================================================================================
 """
 
@@ -53,18 +79,39 @@ import os
 import sys
 import io
 import re
+import csv
+import json
+import hashlib
 import zipfile
+import shutil
 import argparse
 import subprocess
 import warnings
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional
+from urllib.parse import urlparse
 
 import pandas as pd
 import requests
 from tqdm import tqdm
 
+from bcb_comum import (
+    GZIP_BLOCO,
+    GZIP_NIVEL_DEFAULT,
+    GzipParalelo,
+    Medicoes,
+    ParquetEmPartes,
+    criar_sessao,
+    normalizar_cnpj,
+    parquet_disponivel,
+    salvar_parquet,
+)
+
 warnings.filterwarnings("ignore", category=pd.errors.DtypeWarning)
 
 # ==============================================================================
@@ -82,10 +129,27 @@ PERIODO_FIM_DEFAULT = "2025-09"
 REPO_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = REPO_DIR / "dados" / "bcb" / "estban"
 OUTPUT_FILE = OUTPUT_DIR / "estban_municipal_estrategico.csv"
+OUTPUT_PARQUET = OUTPUT_FILE.with_suffix(".parquet")
+
+# Cache local dos arquivos brutos do BCB (não versionado, ver .gitignore)
+CACHE_DIR = OUTPUT_DIR / "_cache"
+
+# SHA-256 do arquivo bruto de cada período publicado (modo --incremental)
+FONTES_FILE = OUTPUT_DIR / "estban_fontes.json"
+
+# Medições da última execução por etapa e por mês (não versionado, ver .gitignore)
+RELATORIO_FILE = OUTPUT_DIR / "estban_execucao.json"
+
+# Saída particionada por mês (Hive: periodo=YYYYMM/part.parquet) + manifesto
+PARTICOES_DIR = OUTPUT_DIR / "particionado"
+MANIFESTO_FILE = PARTICOES_DIR / "manifesto.json"
 
 # Limite GitHub (aviso se > 90MB)
 GITHUB_FILE_LIMIT_MB = 90
 
+# Linhas serializadas por vez na gravação do CSV
+CSV_LINHAS_POR_BLOCO = 100_000
+
 # Encoding padrão dos arquivos BCB
 BCB_ENCODING = "latin-1"
 BCB_SEPARATOR = ";"
@@ -95,6 +159,22 @@ BCB_SKIPROWS = 2
 DOWNLOAD_TIMEOUT = 120
 DOWNLOAD_RETRIES = 3
 
+# Downloads simultâneos (meses baixados em paralelo)
+DOWNLOAD_WORKERS_DEFAULT = 4
+
+# Início dos processos de --jobs: o pool nasce com as threads de download e a
+# sessão HTTP já ativas, então não usa fork (copiaria threads e locks no meio
+# do uso). "forkserver" no Linux/macOS, "spawn" no Windows.
+JOBS_CONTEXTO = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+DOWNLOAD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/131.0.0.0 Safari/537.36",
+    "Accept": "*/*",
+    "Accept-Encoding": "gzip, deflate, br",
+}
+
 # ==============================================================================
 # MAPEAMENTO DE VERBETES ESTRATÉGICOS
 # ==============================================================================
@@ -162,6 +242,9 @@ COLUNAS_SAIDA_KPIS = [
     "Mix Poupança (%)",
 ]
 
+# Colunas de código mantidas como category (poucos valores, muitas repetições)
+COLUNAS_CATEGORICAS = ["CODMUN", "CNPJ"]
+
 
 # ==============================================================================
 # FUNÇÕES DE GERAÇÃO DE URLs
@@ -221,50 +304,226 @@ def gerar_periodos(inicio: str, fim: str) -> list[dict]:
 # FUNÇÕES DE DOWNLOAD
 # ==============================================================================
 
-def download_arquivo(urls: list[str], label: str) -> Optional[bytes]:
+def download_arquivo(
+    urls: list[str],
+    label: str,
+    session: Optional[requests.Session] = None,
+    cache_dir: Optional[Path] = None,
+    etapa: Optional[dict] = None,
+) -> Optional[bytes]:
     """
     Tenta baixar arquivo de uma lista de URLs (fallback).
+
+    Com `cache_dir`, cada URL já baixada é revalidada com GET condicional
+    (If-None-Match / If-Modified-Since): se o BCB responder 304, o conteúdo
+    vem do cache local e nada é transferido. Se a rede falhar, a última
+    cópia em cache é usada como contingência.
     
     Args:
         urls: Lista de URLs para tentar
         label: Label para log (ex: "01/2023")
+        session: Sessão compartilhada (criar_sessao); se None, cria uma
+        cache_dir: Pasta do cache de arquivos brutos; None desativa o cache
+        etapa: Registro de Medicoes.etapa; recebe "cache" (True se o conteúdo
+               veio do cache) e "bytes" transferidos (só em respostas 200)
     
     Returns:
         bytes do arquivo ou None se falhar
     """
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/131.0.0.0 Safari/537.36",
-        "Accept": "*/*",
-        "Accept-Encoding": "gzip, deflate, br",
-    })
+    if session is None:
+        session = criar_sessao(headers=DOWNLOAD_HEADERS)
+    etapa = {} if etapa is None else etapa
+    etapa["cache"] = False
+
+    contingencia = None
 
     for url in urls:
+        em_cache = _ler_cache(cache_dir, url) if cache_dir else None
+        headers = {}
+        if em_cache:
+            meta, conteudo_cache = em_cache
+            contingencia = contingencia or conteudo_cache
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
         for tentativa in range(DOWNLOAD_RETRIES):
             try:
-                resp = session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True)
-                if resp.status_code == 200:
-                    content = resp.content
-                    if len(content) > 100:  # Mínimo razoável
-                        return content
-                elif resp.status_code == 404:
-                    break  # Próxima URL, este padrão não existe
-                else:
-                    continue  # Retry
+                # O with devolve a conexão ao pool também em 304/404/5xx
+                with session.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT, stream=True) as resp:
+                    if resp.status_code == 304 and em_cache:
+                        etapa["cache"] = True
+                        return em_cache[1]  # Não mudou desde o último download
+                    if resp.status_code == 200:
+                        content = resp.content
+                        if len(content) > 100:  # Mínimo razoável
+                            if cache_dir:
+                                _gravar_cache(cache_dir, url, content, resp.headers)
+                            etapa["bytes"] = len(content)
+                            return content
+                    elif resp.status_code == 404:
+                        break  # Próxima URL, este padrão não existe
             except requests.exceptions.RequestException:
-                if tentativa < DOWNLOAD_RETRIES - 1:
-                    import time
-                    time.sleep(2 * (tentativa + 1))
-                continue
+                pass
+            # Retry (5xx, resposta curta ou erro de rede) com backoff
+            if tentativa < DOWNLOAD_RETRIES - 1:
+                import time
+                time.sleep(2 * (tentativa + 1))
 
-    return None
+    if contingencia is not None:
+        tqdm.write(f"  [AVISO] {label} - BCB indisponível, usando cópia do cache")
+        etapa["cache"] = True
+    return contingencia
+
+
+def _chave_cache(url: str) -> str:
+    """Nome do registro de cache: arquivo da URL (contém o período) + hash da URL."""
+    nome = Path(urlparse(url).path).name or "arquivo"
+    return f"{nome}.{hashlib.sha1(url.encode()).hexdigest()[:10]}"
+
+
+def _ler_cache(cache_dir: Path, url: str) -> Optional[tuple[dict, bytes]]:
+    """
+    Lê o registro de cache de uma URL, validando o conteúdo pelo SHA-256.
+
+    Returns:
+        (metadados, conteudo) ou None se ausente/corrompido
+    """
+    meta_path = cache_dir / f"{_chave_cache(url)}.json"
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        conteudo = (cache_dir / "objetos" / meta["sha256"]).read_bytes()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if hashlib.sha256(conteudo).hexdigest() != meta["sha256"]:
+        return None
+    return meta, conteudo
+
+
+# Serializa a troca de metadados e a remoção de objetos entre as threads de download
+_CACHE_LOCK = threading.Lock()
+
+
+def _gravar_cache(cache_dir: Path, url: str, conteudo: bytes, headers) -> None:
+    """
+    Grava o conteúdo no cache (endereçado pelo SHA-256) e os metadados
+    da URL (ETag / Last-Modified) para o próximo GET condicional.
+
+    O objeto da versão anterior da URL só é removido se nenhuma outra URL
+    (ex.: variante .ZIP/.csv do mesmo mês) ainda apontar para ele.
+    """
+    try:
+        objetos = cache_dir / "objetos"
+        objetos.mkdir(parents=True, exist_ok=True)
+
+        sha256 = hashlib.sha256(conteudo).hexdigest()
+        objeto = objetos / sha256
+        if not objeto.exists():
+            tmp = objeto.with_suffix(".tmp")
+            tmp.write_bytes(conteudo)
+            os.replace(tmp, objeto)
+
+        meta_path = cache_dir / f"{_chave_cache(url)}.json"
+        meta = {
+            "url": url,
+            "sha256": sha256,
+            "tamanho": len(conteudo),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "baixado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        with _CACHE_LOCK:
+            anterior = _sha256_registrado(meta_path)
+            meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+            # Remove a versão anterior substituída, se ficou sem referência
+            if anterior and anterior != sha256 and not any(
+                _sha256_registrado(outro) == anterior for outro in cache_dir.glob("*.json")
+            ):
+                (objetos / anterior).unlink(missing_ok=True)
+    except OSError as e:
+        tqdm.write(f"  [AVISO] Falha ao gravar cache: {e}")
+
+
+def _sha256_registrado(meta_path: Path) -> Optional[str]:
+    """SHA-256 do objeto apontado por um registro de cache (None se ilegível)."""
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))["sha256"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _baixar_medido(
+    item: dict,
+    session: requests.Session,
+    cache_dir: Optional[Path],
+    medicoes: Medicoes,
+) -> Optional[bytes]:
+    """download_arquivo de um período, registrado como etapa "download"."""
+    with medicoes.etapa("download", item["periodo"]) as etapa:
+        return download_arquivo(item["urls"], item["label"], session, cache_dir, etapa)
+
+
+def baixar_periodos(
+    periodos: list[dict],
+    workers: int = DOWNLOAD_WORKERS_DEFAULT,
+    cache_dir: Optional[Path] = None,
+    medicoes: Optional[Medicoes] = None,
+):
+    """
+    Baixa os arquivos dos períodos em paralelo, entregando na ordem original.
+
+    Mantém no máximo `workers` downloads em andamento e outros tantos já
+    concluídos aguardando consumo, para que a memória não cresça com o
+    tamanho do intervalo.
+
+    Args:
+        periodos: Lista gerada por gerar_periodos()
+        workers: Número máximo de downloads simultâneos
+        cache_dir: Pasta do cache de arquivos brutos (None desativa)
+        medicoes: Onde registrar o tempo e os bytes de cada download
+
+    Yields:
+        Tuplas (item, conteudo) na mesma ordem de `periodos`,
+        com conteudo = None quando o download falhar
+    """
+    # Uma única sessão (pool de conexões keep-alive) para todos os meses
+    session = criar_sessao(pool_size=workers, headers=DOWNLOAD_HEADERS)
+    medicoes = medicoes or Medicoes()
+
+    if workers <= 1:
+        for item in periodos:
+            yield item, _baixar_medido(item, session, cache_dir, medicoes)
+        return
+
+    fila = iter(periodos)
+    pendentes = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def _agendar():
+            item = next(fila, None)
+            if item is not None:
+                futuro = executor.submit(_baixar_medido, item, session, cache_dir, medicoes)
+                pendentes.append((item, futuro))
+
+        for _ in range(workers * 2):
+            _agendar()
+
+        while pendentes:
+            item, futuro = pendentes.popleft()
+            conteudo = futuro.result()
+            _agendar()
+            yield item, conteudo
 
 
 def extrair_csv_de_bytes(conteudo: bytes, url: str) -> Optional[pd.DataFrame]:
     """
     Extrai DataFrame de bytes (ZIP ou CSV direto).
+
+    O CSV é lido em streaming direto do membro do ZIP, sem descompactar
+    o arquivo inteiro para a memória.
     
     Args:
         conteudo: bytes do arquivo baixado
@@ -293,58 +552,92 @@ def extrair_csv_de_bytes(conteudo: bytes, url: str) -> Optional[pd.DataFrame]:
                     print(f"    [AVISO] ZIP vazio ou sem CSV")
                     return None
 
-                with zf.open(csv_names[0]) as f:
-                    raw = f.read()
-                    return _parse_csv_bytes(raw)
+                return _parse_csv_stream(lambda: zf.open(csv_names[0]))
         else:
             # CSV direto (sem compressão)
-            return _parse_csv_bytes(conteudo)
+            return _parse_csv_stream(lambda: io.BytesIO(conteudo))
 
     except (zipfile.BadZipFile, Exception) as e:
         print(f"    [ERRO] Falha ao extrair: {e}")
         return None
 
 
-def _parse_csv_bytes(raw: bytes) -> Optional[pd.DataFrame]:
+def _detectar_header(stream) -> tuple[int, list[str]]:
     """
-    Faz o parse dos bytes CSV brutos do ESTBAN.
-    
-    Trata os 2 headers informativos do BCB e detecta encoding.
+    Detecta a linha de cabeçalho real do CSV ESTBAN e suas colunas.
+
+    O BCB coloca 2 linhas de cabeçalho antes dos dados
+    Linha 1: nome do relatório
+    Linha 2: data de referência
+    Linha 3: cabeçalho real das colunas
+
+    Lê apenas as primeiras linhas do stream.
+
+    Returns:
+        (índice da linha de cabeçalho, nomes das colunas)
     """
-    # Tenta detectar encoding
-    for enc in [BCB_ENCODING, "utf-8", "cp1252"]:
-        try:
-            texto = raw.decode(enc)
+    for i in range(10):
+        linha = stream.readline()
+        if not linha:
             break
-        except (UnicodeDecodeError, LookupError):
-            continue
-    else:
-        texto = raw.decode(BCB_ENCODING, errors="replace")
+        linha = linha.decode(BCB_ENCODING).rstrip("\r\n")
+        if "DATA_BASE" in linha.upper() or "CODMUN" in linha.upper():
+            return i, next(csv.reader([linha], delimiter=BCB_SEPARATOR))
+    return 0, []
 
-    # O BCB coloca 2 linhas de cabeçalho antes dos dados
-    # Linha 1: nome do relatório
-    # Linha 2: data de referência
-    # Linha 3: cabeçalho real das colunas
-    linhas = texto.split("\n")
 
-    # Detecta onde começa o header real (linha com "DATA_BASE" ou "#DATA_BASE")
-    header_idx = 0
-    for i, linha in enumerate(linhas[:10]):
-        if "DATA_BASE" in linha.upper() or "CODMUN" in linha.upper():
-            header_idx = i
-            break
+def _colunas_necessarias(colunas: list[str]) -> tuple[set[str], set[str]]:
+    """
+    Resolve, a partir do cabeçalho, as colunas que transformar_dataframe usa.
 
-    # Reconstrói CSV a partir do header real
-    csv_limpo = "\n".join(linhas[header_idx:])
+    Returns:
+        (colunas de identificação DATA_BASE/CODMUN/CNPJ, colunas de verbetes
+        estratégicos); ambos vazios se nenhum verbete for reconhecido
+    """
+    colunas_id = identificar_colunas_id(colunas)
+    colunas_verbete = identificar_colunas_verbetes(colunas)
+    if not colunas_verbete:
+        return set(), set()
+
+    texto = {colunas_id[c] for c in ["DATA_BASE", "CODMUN", "CNPJ"] if c in colunas_id}
+    return texto, set(colunas_verbete.values())
+
+
+def _parse_csv_stream(abrir) -> Optional[pd.DataFrame]:
+    """
+    Faz o parse do CSV ESTBAN lendo direto de um stream binário.
+
+    Args:
+        abrir: Função sem argumentos que devolve um novo stream binário do CSV
+               (chamada duas vezes: detecção do cabeçalho e leitura)
+
+    Pula os 2 headers informativos do BCB sem decodificar o arquivo inteiro
+    em memória e lê apenas as colunas estratégicas (usecols). Os verbetes
+    são convertidos já na leitura pelo parser C (decimal=',', thousands='.');
+    colunas com valores fora do padrão BR ficam como texto e são tratadas
+    por _converter_numerico. Se nenhum verbete for reconhecido no cabeçalho,
+    lê todas as colunas como texto.
+    O encoding é latin-1 (aceita qualquer byte).
+    """
+    with abrir() as f:
+        header_idx, colunas = _detectar_header(f)
+
+    texto, numericas = _colunas_necessarias(colunas)
+    necessarias = texto | numericas
 
     try:
-        df = pd.read_csv(
-            io.StringIO(csv_limpo),
-            sep=BCB_SEPARATOR,
-            encoding=enc,
-            low_memory=False,
-            dtype=str,  # Tudo como string inicialmente
-        )
+        with abrir() as f:
+            df = pd.read_csv(
+                f,
+                sep=BCB_SEPARATOR,
+                encoding=BCB_ENCODING,
+                skiprows=header_idx,
+                usecols=(lambda c: c in necessarias) if necessarias else None,
+                dtype={c: str for c in texto} if necessarias else str,
+                decimal=",",
+                thousands=".",
+                low_memory=False,
+            )
         return df
     except Exception as e:
         print(f"    [ERRO] Falha no parse CSV: {e}")
@@ -436,7 +729,7 @@ def identificar_colunas_id(colunas: list[str]) -> dict:
     return mapa
 
 
-def transformar_dataframe(df: pd.DataFrame, periodo: str) -> Optional[pd.DataFrame]:
+def transformar_dataframe(df: pd.DataFrame, periodo: str, kpi_float32: bool = False) -> Optional[pd.DataFrame]:
     """
     Transforma um DataFrame ESTBAN bruto no formato estratégico.
     
@@ -444,11 +737,13 @@ def transformar_dataframe(df: pd.DataFrame, periodo: str) -> Optional[pd.DataFra
     2. Filtra apenas verbetes estratégicos
     3. Consolida depósitos à vista (401-419)
     4. Calcula KPIs derivados
-    5. Formata tipos de dados
+    5. Formata tipos de dados (Período como datetime YYYY-MM-01,
+       CODMUN/CNPJ como category, ver _compactar_tipos)
     
     Args:
         df: DataFrame bruto do CSV ESTBAN
         periodo: "YYYYMM" para fallback de DATA_BASE
+        kpi_float32: Grava os KPIs (%) como float32 em vez de float64
     
     Returns:
         DataFrame transformado ou None
@@ -475,29 +770,26 @@ def transformar_dataframe(df: pd.DataFrame, periodo: str) -> Optional[pd.DataFra
 
     # Colunas de identificação
     if "DATA_BASE" in colunas_id:
-        resultado["Período"] = df[colunas_id["DATA_BASE"]].astype(str).str.strip()
+        resultado["Período"] = _normalizar_data_base(df[colunas_id["DATA_BASE"]], periodo)
     else:
         # Usa o período do arquivo como fallback
-        resultado["Período"] = periodo
+        resultado["Período"] = _normalizar_data_base(pd.Series(periodo, index=df.index), periodo)
 
     if "CODMUN" in colunas_id:
         resultado["CODMUN"] = df[colunas_id["CODMUN"]].astype(str).str.strip()
 
     if "CNPJ" in colunas_id:
-        resultado["CNPJ"] = (
-            df[colunas_id["CNPJ"]]
-            .astype(str)
-            .str.strip()
-            .str.replace(r"\D", "", regex=True)
-            .str.zfill(8)
-            .str[:8]  # Primeiros 8 dígitos (raiz do CNPJ)
-        )
+        # Primeiros 8 dígitos (raiz do CNPJ), normalizando só os valores distintos
+        resultado["CNPJ"] = normalizar_cnpj(df[colunas_id["CNPJ"]], raiz=True)
+
+    # --- Conversão numérica de todos os verbetes em uma passada ---
+    numericos = _converter_numerico(df[list(dict.fromkeys(colunas_verbete.values()))])
 
     # --- Verbetes individuais ---
     for num_verbete, nome_amigavel in VERBETES_INDIVIDUAIS.items():
         if num_verbete in colunas_verbete:
             col_original = colunas_verbete[num_verbete]
-            resultado[nome_amigavel] = _converter_numerico(df[col_original])
+            resultado[nome_amigavel] = numericos[col_original]
         else:
             resultado[nome_amigavel] = 0.0
 
@@ -508,8 +800,7 @@ def transformar_dataframe(df: pd.DataFrame, periodo: str) -> Optional[pd.DataFra
             cols_dep_vista.append(colunas_verbete[num])
 
     if cols_dep_vista:
-        dep_vista_df = df[cols_dep_vista].apply(_converter_numerico)
-        resultado["Depósitos à Vista Total"] = dep_vista_df.sum(axis=1)
+        resultado["Depósitos à Vista Total"] = numericos[cols_dep_vista].sum(axis=1)
     else:
         resultado["Depósitos à Vista Total"] = 0.0
 
@@ -544,9 +835,6 @@ def transformar_dataframe(df: pd.DataFrame, periodo: str) -> Optional[pd.DataFra
         * 100
     ).round(2)
 
-    # --- Formatar Período como date (YYYY-MM-01) ---
-    resultado["Período"] = resultado["Período"].apply(_formatar_data_base)
-
     # Preencher NaN nos KPIs com None (será vazio no CSV)
     for col_kpi in COLUNAS_SAIDA_KPIS:
         resultado[col_kpi] = resultado[col_kpi].where(
@@ -562,21 +850,115 @@ def transformar_dataframe(df: pd.DataFrame, periodo: str) -> Optional[pd.DataFra
 
     resultado = resultado[colunas_finais]
 
-    return resultado
+    return _compactar_tipos(resultado, kpi_float32)
+
+
+def _compactar_tipos(df: pd.DataFrame, kpi_float32: bool = False) -> pd.DataFrame:
+    """
+    Reduz o consumo de memória do DataFrame de saída.
+
+    CODMUN e CNPJ viram category (códigos inteiros + categorias ordenadas,
+    então ordenar pela coluna equivale a ordenar pelo texto). Com
+    `kpi_float32`, os KPIs (%) passam a float32; os verbetes continuam
+    float64, pois são valores em reais de até 13 dígitos.
+    """
+    df = df.copy(deep=False)
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    if kpi_float32:
+        for col in COLUNAS_SAIDA_KPIS:
+            if col in df.columns:
+                df[col] = df[col].astype("float32")
+    return df
+
+
+def _unificar_categorias(dfs: list[pd.DataFrame]) -> None:
+    """
+    Iguala as categorias de CODMUN/CNPJ entre os DataFrames (in place).
+
+    pd.concat só preserva o dtype category quando as categorias são
+    idênticas; caso contrário, o resultado volta a ser texto.
+    """
+    for col in COLUNAS_CATEGORICAS:
+        series = [df[col] for df in dfs if col in df.columns]
+        if not series:
+            continue
+        categorias = sorted(set().union(*(s.cat.categories for s in series)))
+        for df in dfs:
+            if col in df.columns:
+                df[col] = df[col].cat.set_categories(categorias)
+
+
+def _memoria_mb(df: pd.DataFrame) -> float:
+    """Memória ocupada pelo DataFrame (incluindo textos) em MB."""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def _memoria_sem_compactar_mb(df: pd.DataFrame) -> float:
+    """
+    Estima a memória do mesmo DataFrame com CODMUN/CNPJ como objetos str
+    e todos os valores em float64 (layout anterior), sem materializá-lo.
+    """
+    total = df.index.memory_usage() + 8 * len(df) * len(df.columns)
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns:
+            serie = df[col]
+            contagem = serie.cat.codes[serie.cat.codes >= 0].value_counts()
+            tamanhos = [sys.getsizeof(v) for v in serie.cat.categories]
+            total += sum(tamanhos[codigo] * n for codigo, n in contagem.items())
+    return total / (1024 * 1024)
+
+
+def _converter_numerico(dados: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte colunas numéricas em formato BR para float64, vazios → 0.
+
+    Colunas já numéricas (convertidas na leitura com decimal=',' e
+    thousands='.') só têm os vazios preenchidos. As colunas que ficaram
+    como texto são empilhadas em uma única série e limpas de uma vez
+    (remove milhar, troca vírgula decimal, descarta caracteres inválidos).
+    """
+    resultado = dados.select_dtypes("number").astype("float64")
+    texto = [c for c in dados.columns if c not in resultado.columns]
+
+    if texto:
+        serie = (
+            pd.concat([dados[c].astype(str) for c in texto], ignore_index=True)
+            .str.strip()
+            .str.replace(".", "", regex=False)   # Remove separador de milhar
+            .str.replace(",", ".", regex=False)   # Troca vírgula decimal
+            .str.replace(r"[^\d.\-]", "", regex=True)  # Remove caracteres inválidos
+            .pipe(pd.to_numeric, errors="coerce")
+        )
+        convertidas = serie.to_numpy(dtype="float64").reshape((len(dados), len(texto)), order="F")
+        for i, col in enumerate(texto):
+            resultado[col] = convertidas[:, i]
+
+    return resultado[list(dados.columns)].fillna(0.0)
 
 
-def _converter_numerico(serie: pd.Series) -> pd.Series:
-    """Converte série string para numérico, tratando formatação BR."""
-    return (
-        serie
-        .astype(str)
-        .str.strip()
-        .str.replace(".", "", regex=False)   # Remove separador de milhar
-        .str.replace(",", ".", regex=False)   # Troca vírgula decimal
-        .str.replace(r"[^\d.\-]", "", regex=True)  # Remove caracteres inválidos
-        .pipe(pd.to_numeric, errors="coerce")
-        .fillna(0.0)
+def _normalizar_data_base(serie: pd.Series, periodo: str) -> pd.Series:
+    """
+    Converte a coluna DATA_BASE em datetime (dia fixo = 01).
+
+    O valor costuma ser constante dentro do arquivo mensal, então o formato
+    é interpretado apenas uma vez por valor distinto (_formatar_data_base)
+    e o resultado é expandido para a coluna inteira via códigos.
+
+    Valores não reconhecidos assumem o período do arquivo (YYYYMM).
+    """
+    codigos, unicos = pd.factorize(serie)
+    datas_unicas = pd.to_datetime(
+        [_formatar_data_base(v) for v in unicos],
+        format="%Y-%m-%d",
+        errors="coerce",
     )
+    fallback = pd.Timestamp(f"{periodo[:4]}-{periodo[4:6]}-01")
+    datas_unicas = datas_unicas.fillna(fallback).append(pd.DatetimeIndex([fallback]))
+
+    # Código -1 (valor vazio) aponta para o fallback, último elemento
+    return pd.Series(datas_unicas.take(codigos), index=serie.index)
 
 
 def _formatar_data_base(valor: str) -> str:
@@ -608,21 +990,578 @@ def _formatar_data_base(valor: str) -> str:
     return valor
 
 
+# ==============================================================================
+# FUNÇÕES DE PROCESSAMENTO
+# ==============================================================================
+
+def processar_periodo(
+    conteudo: bytes,
+    url: str,
+    periodo: str,
+    kpi_float32: bool = False,
+) -> tuple[Optional[pd.DataFrame], Optional[str], list[dict]]:
+    """
+    Extrai e transforma o arquivo de um mês.
+
+    Função de nível de módulo para poder rodar em processos separados
+    (ProcessPoolExecutor); o DataFrame tipado volta serializado via pickle,
+    junto com as medições das etapas feitas no processo.
+
+    Returns:
+        Tupla (DataFrame transformado, None, etapas) ou
+        (None, motivo da falha, etapas), com etapas = lista de registros
+        de Medicoes.etapa ("extracao" e, se chegou lá, "transformacao")
+    """
+    medicoes = Medicoes()
+    with medicoes.etapa("extracao", periodo) as etapa:
+        df_bruto = extrair_csv_de_bytes(conteudo, url)
+        etapa["bytes"] = len(conteudo)
+        etapa["linhas"] = 0 if df_bruto is None else len(df_bruto)
+    if df_bruto is None or df_bruto.empty:
+        return None, "Erro na extração", medicoes.etapas
+
+    with medicoes.etapa("transformacao", periodo) as etapa:
+        df_transformado = transformar_dataframe(df_bruto, periodo, kpi_float32)
+        etapa["linhas"] = 0 if df_transformado is None else len(df_transformado)
+    if df_transformado is None or df_transformado.empty:
+        return None, "Erro na transformação", medicoes.etapas
+
+    return df_transformado, None, medicoes.etapas
+
+
+def processar_periodos(
+    downloads,
+    jobs: int = 1,
+    pular=None,
+    kpi_float32: bool = False,
+    medicoes: Optional[Medicoes] = None,
+):
+    """
+    Extrai e transforma os meses baixados, opcionalmente em processos paralelos.
+
+    Os resultados saem sempre na ordem de `downloads`; no máximo 2 × `jobs`
+    meses ficam em processamento ou aguardando consumo.
+
+    Args:
+        downloads: Iterável de (item, conteudo), como o de baixar_periodos()
+        jobs: Processos de extração/transformação (1 = no processo atual)
+        pular: Função (item, sha256) -> bool; True marca o mês como
+               inalterado e ele não é processado
+        kpi_float32: Repassado a transformar_dataframe
+        medicoes: Recebe as etapas de extração/transformação de cada mês
+
+    Yields:
+        (item, sha256, DataFrame, motivo), onde:
+            - sucesso:     DataFrame preenchido, motivo None
+            - inalterado:  DataFrame None, motivo None
+            - falha:       DataFrame None, motivo com a descrição
+    """
+    pool = None
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context(JOBS_CONTEXTO))
+    limite = jobs * 2 if pool is not None else 0
+    pendentes = deque()
+    medicoes = medicoes or Medicoes()
+
+    def _resultado(pendente):
+        item, sha256, resultado = pendente
+        if isinstance(resultado, Future):
+            resultado = resultado.result()
+        df, motivo, etapas = resultado
+        medicoes.adicionar(etapas)
+        return item, sha256, df, motivo
+
+    try:
+        for item, conteudo in downloads:
+            if conteudo is None:
+                resultado = (None, "Arquivo não disponível", [])
+                sha256 = None
+            else:
+                sha256 = hashlib.sha256(conteudo).hexdigest()
+                if pular is not None and pular(item, sha256):
+                    resultado = (None, None, [])
+                elif pool is None:
+                    resultado = processar_periodo(
+                        conteudo, item["urls"][0], item["periodo"], kpi_float32
+                    )
+                else:
+                    resultado = pool.submit(
+                        processar_periodo, conteudo, item["urls"][0], item["periodo"], kpi_float32
+                    )
+            pendentes.append((item, sha256, resultado))
+
+            while len(pendentes) > limite:
+                yield _resultado(pendentes.popleft())
+
+        while pendentes:
+            yield _resultado(pendentes.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+# ==============================================================================
+# SAÍDA PUBLICADA (MODO INCREMENTAL)
+# ==============================================================================
+
+def _ler_saida_existente() -> Optional[pd.DataFrame]:
+    """
+    Lê o consolidado já publicado (.csv ou .csv.gz).
+
+    Returns:
+        DataFrame no mesmo formato de transformar_dataframe ou None se não existir
+    """
+    for arquivo in [OUTPUT_FILE, OUTPUT_FILE.with_suffix(".csv.gz")]:
+        if arquivo.exists():
+            try:
+                return pd.read_csv(
+                    arquivo,
+                    sep=";",
+                    encoding="utf-8",
+                    dtype={col: "category" for col in COLUNAS_CATEGORICAS},
+                    parse_dates=["Período"],
+                )
+            except Exception as e:
+                print(f"  [AVISO] Falha ao ler saída existente ({arquivo.name}): {e}")
+                return None
+    return None
+
+
+def _chave_periodo(serie: pd.Series) -> pd.Series:
+    """Converte a coluna Período (datetime) na chave YYYYMM usada em gerar_periodos."""
+    return serie.dt.strftime("%Y%m")
+
+
+def _ler_fontes() -> dict:
+    """Lê o SHA-256 do arquivo bruto de cada período publicado ({YYYYMM: sha256})."""
+    try:
+        return json.loads(FONTES_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_fontes(fontes: dict) -> None:
+    """Grava o SHA-256 dos arquivos brutos junto à saída publicada."""
+    FONTES_FILE.write_text(
+        json.dumps(dict(sorted(fontes.items())), indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
+# ==============================================================================
+# GRAVAÇÃO DO CSV
+# ==============================================================================
+
+def salvar_csv(
+    df: pd.DataFrame,
+    nivel: int = GZIP_NIVEL_DEFAULT,
+    threads: Optional[int] = None,
+) -> float:
+    """
+    Grava o consolidado em .csv (e .csv.gz, se preciso) serializando o
+    DataFrame uma só vez.
+
+    Cada bloco de linhas vira texto CSV uma única vez e vai para os
+    destinos de _SaidaCsv, que decide quando o .gz é necessário e só
+    substitui a saída publicada se a gravação terminar sem erro.
+
+    Args:
+        df: Consolidado final
+        nivel: Nível de compressão gzip (1-9)
+        threads: Threads de compressão (None = número de CPUs)
+
+    Returns:
+        Tamanho do CSV em MB
+    """
+    saida = _SaidaCsv(nivel, threads)
+    try:
+        for inicio in range(0, len(df), CSV_LINHAS_POR_BLOCO):
+            bloco = df.iloc[inicio:inicio + CSV_LINHAS_POR_BLOCO].to_csv(
+                sep=";",
+                index=False,
+                header=inicio == 0,
+                float_format="%.2f",
+            ).encode("utf-8")
+            saida.write(bloco)
+    except BaseException:
+        saida.descartar()
+        raise
+    return saida.publicar()
+
+
+class _SaidaCsv:
+    """
+    .csv e .csv.gz do consolidado, gravados em temporários ocultos.
+
+    O .gz só é gerado quando será mantido (limite do GitHub):
+        - CSV <= limite: fica o CSV (o .gz só é gerado se já era publicado)
+        - CSV >  limite: fica o .gz (o CSV é removido se o .gz couber)
+    Sem .gz publicado, a compressão começa quando o CSV passa do limite:
+    o que já foi gravado é relido do temporário e os blocos seguintes vão
+    para os dois destinos.
+
+    publicar() substitui a saída publicada; descartar() remove os
+    temporários sem tocar nela.
+    """
+
+    def __init__(self, nivel: int, threads: Optional[int]):
+        self.nivel = nivel
+        self.threads = threads
+        self.gz_publicado = OUTPUT_FILE.with_suffix(".csv.gz").exists()
+        self._tmp_csv = OUTPUT_FILE.with_name(f".{OUTPUT_FILE.name}.tmp")
+        self._tmp_gz = OUTPUT_FILE.with_name(f".{OUTPUT_FILE.name}.gz.tmp")
+        self._limite = GITHUB_FILE_LIMIT_MB * 1024 * 1024
+        self._tamanho = 0
+        self._csv = open(self._tmp_csv, "wb")
+        self._gz = None
+        if self.gz_publicado:
+            self._iniciar_gz()
+
+    def write(self, bloco: bytes) -> None:
+        self._csv.write(bloco)
+        self._tamanho += len(bloco)
+        if self._gz is not None:
+            self._gz.write(bloco)
+        elif self._tamanho > self._limite:
+            self._iniciar_gz()
+
+    def _iniciar_gz(self) -> None:
+        """Abre o .gz e comprime o que o CSV temporário já tem."""
+        self._gz = GzipParalelo(self._tmp_gz, self.nivel, self.threads)
+        self._csv.flush()
+        with open(self._tmp_csv, "rb") as f:
+            for pedaco in iter(lambda: f.read(GZIP_BLOCO * 4), b""):
+                self._gz.write(pedaco)
+
+    def publicar(self) -> float:
+        """
+        Fecha os temporários e substitui a saída publicada.
+
+        Returns:
+            Tamanho do CSV em MB
+        """
+        output_gz = OUTPUT_FILE.with_suffix(".csv.gz")
+        try:
+            self._csv.close()
+            if self._gz is not None:
+                self._gz.close()
+        except BaseException:
+            self.descartar()
+            raise
+
+        tamanho_mb = self._tamanho / (1024 * 1024)
+        print(f"  Arquivo: {OUTPUT_FILE.name}")
+        print(f"  Tamanho: {tamanho_mb:.1f} MB")
+
+        if self._gz is not None:
+            os.replace(self._tmp_gz, output_gz)
+            tamanho_gz = output_gz.stat().st_size / (1024 * 1024)
+        if tamanho_mb > GITHUB_FILE_LIMIT_MB:
+            print(f"\n  [AVISO] Arquivo excede {GITHUB_FILE_LIMIT_MB}MB!")
+            print(f"  Versão gzip: {tamanho_gz:.1f} MB (nível {self.nivel})")
+
+            if tamanho_gz < GITHUB_FILE_LIMIT_MB:
+                # Não publica o CSV grande, mantém .gz
+                self._tmp_csv.unlink()
+                OUTPUT_FILE.unlink(missing_ok=True)
+                print(f"  CSV removido. Use o .csv.gz no Power BI.")
+                return tamanho_mb
+        elif self.gz_publicado:
+            print(f"  Versão gzip atualizada: {tamanho_gz:.1f} MB")
+
+        os.replace(self._tmp_csv, OUTPUT_FILE)
+        return tamanho_mb
+
+    def descartar(self) -> None:
+        """Fecha e remove os temporários sem tocar na saída publicada."""
+        self._csv.close()
+        if self._gz is not None:
+            self._gz.descartar()
+        for tmp in [self._tmp_csv, self._tmp_gz]:
+            tmp.unlink(missing_ok=True)
+
+
+# ==============================================================================
+# SAÍDA PARTICIONADA POR MÊS
+# ==============================================================================
+
+def salvar_particoes(df: pd.DataFrame, alterados: set[str]) -> None:
+    """
+    Grava o consolidado particionado por mês (layout Hive) e o manifesto.
+
+        particionado/periodo=YYYYMM/part.parquet   (ou part.csv.gz sem pyarrow)
+        particionado/manifesto.json
+
+    Só os meses em `alterados` (ou ainda sem partição) são regravados;
+    partições de meses que saíram do consolidado são removidas.
+
+    Args:
+        df: Consolidado final
+        alterados: Períodos YYYYMM processados nesta execução
+    """
+    PARTICOES_DIR.mkdir(parents=True, exist_ok=True)
+    manifesto = _ler_manifesto()
+    formato = "parquet" if parquet_disponivel() else "csv.gz"
+
+    chaves = _chave_periodo(df["Período"])
+    gravadas = 0
+    for chave, grupo in df.groupby(chaves, sort=True):
+        entrada = manifesto.get(chave)
+        if chave in alterados or entrada is None or entrada["formato"] != formato \
+                or not (PARTICOES_DIR / entrada["arquivo"]).exists():
+            manifesto[chave] = _salvar_particao(grupo, chave, formato)
+            gravadas += 1
+
+    _gravar_manifesto(manifesto, set(chaves.unique()), list(df.columns))
+    print(f"  Partições: {len(manifesto)} meses ({gravadas} gravadas) em {PARTICOES_DIR.name}/")
+
+
+def _gravar_manifesto(manifesto: dict, presentes: set[str], colunas: list[str]) -> None:
+    """Remove partições de meses fora de `presentes` e grava o manifesto."""
+    for chave in sorted(set(manifesto) - presentes):
+        shutil.rmtree(PARTICOES_DIR / f"periodo={chave}", ignore_errors=True)
+        del manifesto[chave]
+
+    MANIFESTO_FILE.write_text(
+        json.dumps(
+            {
+                "atualizado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "colunas": colunas,
+                "particoes": dict(sorted(manifesto.items())),
+            },
+            ensure_ascii=False,
+            indent=2,
+        ) + "\n",
+        encoding="utf-8",
+    )
+
+
+def _salvar_particao(df: pd.DataFrame, chave: str, formato: str, raiz: Optional[Path] = None) -> dict:
+    """
+    Grava a partição de um mês e devolve sua entrada do manifesto.
+
+    `raiz` permite gravar em uma pasta temporária com o mesmo layout
+    (padrão: PARTICOES_DIR); o caminho no manifesto é relativo a ela.
+    """
+    raiz = raiz or PARTICOES_DIR
+    pasta = raiz / f"periodo={chave}"
+    pasta.mkdir(parents=True, exist_ok=True)
+    destino = pasta / f"part.{formato}"
+    tmp = pasta / f".part.{formato}.tmp"
+
+    if formato == "parquet":
+        salvar_parquet(df, tmp, texto=("CODMUN", "CNPJ"), datas=("Período",))
+    else:
+        df.to_csv(
+            tmp,
+            sep=";",
+            index=False,
+            encoding="utf-8",
+            float_format="%.2f",
+            compression="gzip",
+        )
+    os.replace(tmp, destino)
+
+    # Remove a partição no formato antigo, se houver
+    for antigo in pasta.glob("part.*"):
+        if antigo != destino:
+            antigo.unlink()
+
+    return {
+        "arquivo": destino.relative_to(raiz).as_posix(),
+        "formato": formato,
+        "registros": len(df),
+        "bytes": destino.stat().st_size,
+        "sha256": hashlib.sha256(destino.read_bytes()).hexdigest(),
+        "atualizado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def _publicar_particoes(origem: Path) -> None:
+    """Move as partições gravadas em `origem` para PARTICOES_DIR e remove `origem`."""
+    PARTICOES_DIR.mkdir(parents=True, exist_ok=True)
+    for arquivo in sorted(origem.glob("periodo=*/part.*")):
+        pasta = PARTICOES_DIR / arquivo.parent.name
+        pasta.mkdir(parents=True, exist_ok=True)
+        destino = pasta / arquivo.name
+        os.replace(arquivo, destino)
+
+        # Remove a partição no formato antigo, se houver
+        for antigo in pasta.glob("part.*"):
+            if antigo != destino:
+                antigo.unlink()
+    shutil.rmtree(origem, ignore_errors=True)
+
+
+def _ler_manifesto() -> dict:
+    """Lê as entradas das partições do manifesto ({YYYYMM: entrada})."""
+    try:
+        return json.loads(MANIFESTO_FILE.read_text(encoding="utf-8"))["particoes"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+# ==============================================================================
+# CONSOLIDAÇÃO EM STREAMING
+# ==============================================================================
+
+class SaidaStreaming:
+    """
+    Consolidação em streaming (--streaming) para intervalos longos.
+
+    Cada mês é ordenado, deduplicado e gravado (CSV, .csv.gz, Parquet e,
+    opcionalmente, partição) assim que fica pronto, sem manter o consolidado
+    em memória: o uso de memória não cresce com o número de meses.
+
+    Como os meses chegam em ordem de período, ordenar cada mês por
+    CODMUN/CNPJ produz a mesma ordem global do modo completo. Duplicatas
+    são removidas dentro de cada mês.
+
+    Os arquivos e as partições são gravados em temporários (partições em
+    .particionado.tmp/) e só substituem a saída publicada em fechar(),
+    junto com o manifesto; descartar() os remove em caso de falha. Até
+    fechar(), particionado/ e seu manifesto continuam os da última
+    publicação.
+    """
+
+    def __init__(self, gzip_nivel: int, gzip_threads: Optional[int], particionado: bool):
+        self.particionado = particionado
+        self._tmp_parquet = OUTPUT_PARQUET.with_name(f".{OUTPUT_PARQUET.name}.tmp")
+
+        self._csv = _SaidaCsv(gzip_nivel, gzip_threads)
+        self._parquet = None
+        if parquet_disponivel():
+            self._parquet = ParquetEmPartes(self._tmp_parquet, texto=("CODMUN", "CNPJ"), datas=("Período",))
+
+        self._tmp_particoes = PARTICOES_DIR.with_name(f".{PARTICOES_DIR.name}.tmp")
+        if particionado:
+            shutil.rmtree(self._tmp_particoes, ignore_errors=True)
+        self._manifesto = _ler_manifesto() if particionado else {}
+        self._formato = "parquet" if parquet_disponivel() else "csv.gz"
+        self._colunas = None
+
+        # Estatísticas acumuladas (conjuntos de códigos são pequenos)
+        self.registros = 0
+        self.duplicatas = 0
+        self.periodos = set()
+        self.codmuns = set()
+        self.cnpjs = set()
+        self.inicio = None
+        self.fim = None
+
+    def escrever(self, df: pd.DataFrame) -> None:
+        """Ordena, deduplica e grava um mês."""
+        df = df.sort_values(["Período", "CODMUN", "CNPJ"], ignore_index=True)
+        antes = len(df)
+        df = df.drop_duplicates()
+        self.duplicatas += antes - len(df)
+
+        bloco = df.to_csv(
+            sep=";",
+            index=False,
+            header=self._colunas is None,
+            float_format="%.2f",
+        ).encode("utf-8")
+        self._csv.write(bloco)
+        if self._parquet is not None:
+            self._parquet.write(df)
+
+        chaves = _chave_periodo(df["Período"])
+        if self.particionado:
+            for chave, grupo in df.groupby(chaves, sort=True):
+                self._manifesto[chave] = _salvar_particao(grupo, chave, self._formato, self._tmp_particoes)
+
+        self._colunas = self._colunas or list(df.columns)
+        self.registros += len(df)
+        self.periodos.update(chaves.unique())
+        self.codmuns.update(df["CODMUN"].unique())
+        self.cnpjs.update(df["CNPJ"].unique())
+        inicio, fim = df["Período"].min(), df["Período"].max()
+        self.inicio = inicio if self.inicio is None else min(self.inicio, inicio)
+        self.fim = fim if self.fim is None else max(self.fim, fim)
+
+    def fechar(self) -> float:
+        """
+        Fecha os arquivos e publica a saída.
+
+        Returns:
+            Tamanho do CSV em MB
+        """
+        if self._parquet is not None:
+            self._parquet.close()
+        tamanho_mb = self._csv.publicar()
+
+        if self._parquet is not None:
+            os.replace(self._tmp_parquet, OUTPUT_PARQUET)
+            tamanho_pq = OUTPUT_PARQUET.stat().st_size / (1024 * 1024)
+            print(f"  Parquet: {OUTPUT_PARQUET.name} ({tamanho_pq:.1f} MB)")
+        else:
+            print(f"  [AVISO] pyarrow não instalado, Parquet não gerado (pip install pyarrow)")
+
+        if self.particionado:
+            _publicar_particoes(self._tmp_particoes)
+            _gravar_manifesto(self._manifesto, self.periodos, self._colunas)
+            print(f"  Partições: {len(self._manifesto)} meses em {PARTICOES_DIR.name}/")
+
+        return tamanho_mb
+
+    def descartar(self) -> None:
+        """Fecha e remove os temporários sem tocar na saída publicada."""
+        self._csv.descartar()
+        if self._parquet is not None:
+            self._parquet.close()
+        self._tmp_parquet.unlink(missing_ok=True)
+        shutil.rmtree(self._tmp_particoes, ignore_errors=True)
+
+
 # ==============================================================================
 # PIPELINE PRINCIPAL
 # ==============================================================================
 
-def executar_pipeline(inicio: str, fim: str, fazer_push: bool = True):
+def executar_pipeline(
+    inicio: str,
+    fim: str,
+    fazer_push: bool = True,
+    workers: int = DOWNLOAD_WORKERS_DEFAULT,
+    usar_cache: bool = True,
+    incremental: bool = False,
+    jobs: int = 1,
+    particionado: bool = False,
+    gzip_nivel: int = GZIP_NIVEL_DEFAULT,
+    gzip_threads: Optional[int] = None,
+    streaming: bool = False,
+    kpi_float32: bool = False,
+):
     """
     Executa o pipeline completo:
     1. Gera lista de períodos/URLs
-    2. Baixa cada arquivo
-    3. Extrai e transforma
-    4. Consolida tudo
-    5. Salva CSV otimizado
+    2. Baixa os arquivos (até `workers` em paralelo, revalidando o cache)
+    3. Extrai e transforma (em `jobs` processos; com `incremental`, só meses
+       novos ou alterados)
+    4. Consolida tudo (com `incremental`, mescla na saída já publicada;
+       com `streaming`, grava cada mês assim que processado)
+    5. Salva CSV otimizado + Parquet (e partições mensais, com `particionado`)
     6. Atualiza README
     7. Git commit + push
+
+    Tempo, bytes, linhas e RSS de cada etapa (por mês, quando aplicável)
+    e o pico de RSS da execução ficam em RELATORIO_FILE.
+
+    Raises:
+        ValueError: `streaming` com `incremental` (a saída em streaming só
+            contém os meses processados na execução; os já publicados
+            seriam perdidos)
     """
+    if streaming and incremental:
+        raise ValueError("streaming e incremental não podem ser usados juntos")
+
+    medicoes = Medicoes()
+    parametros = {
+        "inicio": inicio, "fim": fim, "workers": workers, "jobs": jobs, "usar_cache": usar_cache,
+        "incremental": incremental, "streaming": streaming, "particionado": particionado,
+        "gzip_nivel": gzip_nivel, "kpi_float32": kpi_float32,
+    }
+
     print("\n" + "=" * 70)
     print("  PIPELINE ESTBAN MUNICIPAL - DADOS ESTRATÉGICOS BCB")
     print("  Sicoob Credicom - Inteligência de Mercado")
@@ -631,6 +1570,11 @@ def executar_pipeline(inicio: str, fim: str, fazer_push: bool = True):
     print(f"  Repositório: {REPO_DIR}")
     print(f"  Saída      : {OUTPUT_FILE}")
     print(f"  Git Push   : {'Sim' if fazer_push else 'Não'}")
+    print(f"  Downloads  : {workers} simultâneo(s)")
+    print(f"  Processos  : {jobs}")
+    print(f"  Partições  : {PARTICOES_DIR if particionado else 'Não'}")
+    print(f"  Cache      : {CACHE_DIR if usar_cache else 'Desativado'}")
+    print(f"  Modo       : {'Incremental' if incremental else 'Streaming' if streaming else 'Completo'}")
     print("=" * 70)
 
     # 1. Gerar períodos
@@ -641,129 +1585,213 @@ def executar_pipeline(inicio: str, fim: str, fazer_push: bool = True):
     # 2. Criar diretório de saída
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+    # Saída já publicada (modo incremental)
+    fontes = _ler_fontes()
+    existente = _ler_saida_existente() if incremental else None
+    publicados = set()
+    if existente is not None:
+        publicados = set(_chave_periodo(existente["Período"]).unique())
+        print(f"  Saída existente: {len(existente):,} registros, {len(publicados)} períodos")
+
     # 3. Download + Transformação
     print(f"\n[2/6] Baixando e processando arquivos do BCB...")
     dfs = []
     erros = []
-
-    for item in tqdm(periodos, desc="Processando", ncols=80, unit="mês"):
+    inalterados = []
+    processados = set()
+    saida = SaidaStreaming(gzip_nivel, gzip_threads, particionado) if streaming else None
+
+    def _inalterado(item: dict, sha256: str) -> bool:
+        # Incremental: pula meses publicados cujo arquivo bruto não mudou. Mês
+        # sem hash registrado conta como alterado; o hash só é gravado depois
+        # de o mês ser reprocessado.
         periodo = item["periodo"]
-        label = item["label"]
-        urls = item["urls"]
-
-        # Download
-        conteudo = download_arquivo(urls, label)
-        if conteudo is None:
-            erros.append(label)
-            tqdm.write(f"  [FALHA] {label} - Arquivo não disponível")
-            continue
-
-        # Extrair CSV
-        df_bruto = extrair_csv_de_bytes(conteudo, urls[0])
-        if df_bruto is None or df_bruto.empty:
-            erros.append(label)
-            tqdm.write(f"  [FALHA] {label} - Erro na extração")
-            continue
+        return periodo in publicados and fontes.get(periodo) == sha256
 
-        # Transformar
-        df_transformado = transformar_dataframe(df_bruto, periodo)
-        if df_transformado is None or df_transformado.empty:
-            erros.append(label)
-            tqdm.write(f"  [FALHA] {label} - Erro na transformação")
-            continue
-
-        dfs.append(df_transformado)
-        tqdm.write(f"  [OK] {label} → {len(df_transformado):,} registros")
-
-    # 4. Consolidar
-    print(f"\n[3/6] Consolidando dados...")
-    if not dfs:
-        print("[ERRO FATAL] Nenhum arquivo processado com sucesso!")
-        sys.exit(1)
-
-    df_final = pd.concat(dfs, ignore_index=True)
-
-    # Ordenar: Período, CODMUN, CNPJ
-    df_final = df_final.sort_values(
-        ["Período", "CODMUN", "CNPJ"],
-        ignore_index=True,
+    downloads = tqdm(
+        baixar_periodos(periodos, workers, CACHE_DIR if usar_cache else None, medicoes),
+        total=total, desc="Processando", ncols=80, unit="mês",
     )
+    try:
+        for item, sha256, df_transformado, motivo in processar_periodos(
+            downloads, jobs, _inalterado, kpi_float32, medicoes
+        ):
+            periodo = item["periodo"]
+            label = item["label"]
+
+            if motivo:
+                erros.append(label)
+                tqdm.write(f"  [FALHA] {label} - {motivo}")
+                continue
 
-    # Remove duplicatas exatas
-    antes = len(df_final)
-    df_final = df_final.drop_duplicates()
-    depois = len(df_final)
-    if antes != depois:
-        print(f"  Duplicatas removidas: {antes - depois:,}")
-
-    print(f"  Total consolidado: {len(df_final):,} registros")
-    print(f"  Períodos OK: {len(dfs)}/{total}")
-    if erros:
-        print(f"  Períodos com falha: {', '.join(erros)}")
-
-    # Estatísticas
-    print(f"\n  Resumo dos dados:")
-    print(f"    Municípios distintos : {df_final['CODMUN'].nunique():,}")
-    print(f"    CNPJs distintos     : {df_final['CNPJ'].nunique():,}")
-    print(f"    Período              : {df_final['Período'].min()} a {df_final['Período'].max()}")
-
-    # 5. Salvar CSV
-    print(f"\n[4/6] Salvando arquivo...")
-    df_final.to_csv(
-        OUTPUT_FILE,
-        sep=";",
-        index=False,
-        encoding="utf-8",
-        float_format="%.2f",
-    )
+            if df_transformado is None:
+                inalterados.append(label)
+                tqdm.write(f"  [=] {label} - Sem alteração desde a última publicação")
+                continue
 
-    tamanho_mb = OUTPUT_FILE.stat().st_size / (1024 * 1024)
-    print(f"  Arquivo: {OUTPUT_FILE.name}")
-    print(f"  Tamanho: {tamanho_mb:.1f} MB")
+            if saida is not None:
+                with medicoes.etapa("streaming", periodo) as etapa:
+                    saida.escrever(df_transformado)
+                    etapa["linhas"] = len(df_transformado)
+            else:
+                dfs.append(df_transformado)
+            processados.add(periodo)
+            fontes[periodo] = sha256
+            tqdm.write(f"  [OK] {label} → {len(df_transformado):,} registros")
+
+        periodos_ok = len(processados) + len(inalterados)
+
+        # 4. Consolidar
+        print(f"\n[3/6] Consolidando dados...")
+        if not processados:
+            if saida is not None:
+                saida.descartar()
+            if inalterados:
+                print("  Nenhum período novo ou alterado. Saída publicada já está atualizada.")
+                _gravar_relatorio(medicoes, "inalterado", parametros)
+                return
+            print("[ERRO FATAL] Nenhum arquivo processado com sucesso!")
+            _gravar_relatorio(medicoes, "falha", parametros, falhas=erros)
+            sys.exit(1)
+
+        if saida is not None:
+            df_final = None
+            registros = saida.registros
+            duplicatas = saida.duplicatas
+            resumo = (len(saida.codmuns), len(saida.cnpjs), saida.inicio, saida.fim)
+            print(f"  Streaming: {len(processados)} meses já gravados, {registros:,} registros")
+        else:
+            if existente is not None:
+                # Mantém da saída publicada apenas os períodos não reprocessados
+                mantidos = existente[~_chave_periodo(existente["Período"]).isin(processados)]
+                print(f"  Períodos reprocessados: {len(processados)} │ mantidos: {len(publicados - processados)}")
+                dfs.insert(0, mantidos)
+                del existente
+
+            # Categorias comuns mantêm CODMUN/CNPJ como category após o concat
+            with medicoes.etapa("concat") as etapa:
+                _unificar_categorias(dfs)
+                df_final = pd.concat(dfs, ignore_index=True)
+                etapa["linhas"] = len(df_final)
+            del dfs
+            print(
+                f"  Memória do consolidado: {_memoria_mb(df_final):.1f} MB "
+                f"(sem compactação: ~{_memoria_sem_compactar_mb(df_final):.1f} MB)"
+            )
+
+            # Ordenar: Período, CODMUN, CNPJ
+            with medicoes.etapa("ordenacao") as etapa:
+                df_final = df_final.sort_values(
+                    ["Período", "CODMUN", "CNPJ"],
+                    ignore_index=True,
+                )
+                etapa["linhas"] = len(df_final)
+
+            # Remove duplicatas exatas
+            antes = len(df_final)
+            with medicoes.etapa("deduplicacao") as etapa:
+                df_final = df_final.drop_duplicates()
+                etapa["linhas"] = antes
+            registros = len(df_final)
+            duplicatas = antes - registros
+            if duplicatas:
+                print(f"  Memória após deduplicação: {_memoria_mb(df_final):.1f} MB")
+            resumo = (
+                df_final["CODMUN"].nunique(),
+                df_final["CNPJ"].nunique(),
+                df_final["Período"].min(),
+                df_final["Período"].max(),
+            )
+
+        if duplicatas:
+            print(f"  Duplicatas removidas: {duplicatas:,}")
+
+        print(f"  Total consolidado: {registros:,} registros")
+        print(f"  Períodos OK: {periodos_ok}/{total}")
+        if erros:
+            print(f"  Períodos com falha: {', '.join(erros)}")
+
+        # Estatísticas
+        municipios, cnpjs, periodo_min, periodo_max = resumo
+        print(f"\n  Resumo dos dados:")
+        print(f"    Municípios distintos : {municipios:,}")
+        print(f"    CNPJs distintos     : {cnpjs:,}")
+        print(f"    Período              : {periodo_min:%Y-%m-%d} a {periodo_max:%Y-%m-%d}")
+
+        # 5. Salvar CSV
+        print(f"\n[4/6] Salvando arquivo...")
+        with medicoes.etapa("csv") as etapa:
+            tamanho_mb = saida.fechar() if saida is not None else salvar_csv(df_final, gzip_nivel, gzip_threads)
+            etapa["linhas"] = registros
+            etapa["bytes"] = sum(
+                f.stat().st_size for f in (OUTPUT_FILE, OUTPUT_FILE.with_suffix(".csv.gz")) if f.exists()
+            )
+    except BaseException:
+        # Não deixa temporários nem a thread de compressão para trás
+        if saida is not None:
+            saida.descartar()
+        raise
+
+    if saida is None:
+        # Parquet tipado (CODMUN/CNPJ com dicionário, Período date32, valores float64)
+        with medicoes.etapa("parquet") as etapa:
+            parquet_ok = salvar_parquet(df_final, OUTPUT_PARQUET, texto=("CODMUN", "CNPJ"), datas=("Período",))
+            etapa["linhas"] = registros if parquet_ok else 0
+            etapa["bytes"] = OUTPUT_PARQUET.stat().st_size if parquet_ok else 0
+        if parquet_ok:
+            tamanho_pq = OUTPUT_PARQUET.stat().st_size / (1024 * 1024)
+            print(f"  Parquet: {OUTPUT_PARQUET.name} ({tamanho_pq:.1f} MB)")
+        else:
+            print(f"  [AVISO] pyarrow não instalado, Parquet não gerado (pip install pyarrow)")
 
-    if tamanho_mb > GITHUB_FILE_LIMIT_MB:
-        print(f"\n  [AVISO] Arquivo excede {GITHUB_FILE_LIMIT_MB}MB!")
-        print(f"  Gerando versão compactada (.csv.gz)...")
-        output_gz = OUTPUT_FILE.with_suffix(".csv.gz")
-        df_final.to_csv(
-            output_gz,
-            sep=";",
-            index=False,
-            encoding="utf-8",
-            float_format="%.2f",
-            compression="gzip",
-        )
-        tamanho_gz = output_gz.stat().st_size / (1024 * 1024)
-        print(f"  Versão gzip: {tamanho_gz:.1f} MB")
+        if particionado:
+            with medicoes.etapa("particoes") as etapa:
+                salvar_particoes(df_final, processados)
+                etapa["linhas"] = registros
 
-        if tamanho_gz < GITHUB_FILE_LIMIT_MB:
-            # Remove CSV grande, mantém .gz
-            OUTPUT_FILE.unlink()
-            print(f"  CSV removido. Use o .csv.gz no Power BI.")
+    _gravar_fontes(fontes)
 
     # 6. Atualizar README
     print(f"\n[5/6] Atualizando README.md...")
-    atualizar_readme(df_final, inicio, fim, len(dfs), total, erros, tamanho_mb)
+    with medicoes.etapa("readme"):
+        atualizar_readme(df_final, inicio, fim, periodos_ok, total, erros, tamanho_mb)
 
     # 7. Git push
     if fazer_push:
         print(f"\n[6/6] Publicando no GitHub...")
-        git_push()
+        with medicoes.etapa("git"):
+            git_push()
     else:
         print(f"\n[6/6] Git push desabilitado (--no-push)")
 
+    relatorio = _gravar_relatorio(
+        medicoes, "ok", parametros, registros=registros, periodos_ok=periodos_ok, falhas=erros
+    )
+
     # Relatório final
     print("\n" + "=" * 70)
     print("  PIPELINE CONCLUÍDO COM SUCESSO!")
     print("=" * 70)
     print(f"  Arquivo    : {OUTPUT_FILE.name}")
-    print(f"  Registros  : {len(df_final):,}")
+    print(f"  Registros  : {registros:,}")
     print(f"  Tamanho    : {tamanho_mb:.1f} MB")
-    print(f"  Períodos   : {len(dfs)}/{total} OK")
+    print(f"  Períodos   : {periodos_ok}/{total} OK")
+    print(f"  Duração    : {relatorio['duracao_s']:.1f}s (etapas em {RELATORIO_FILE.name})")
+    for nome, etapa in relatorio["resumo"].items():
+        print(f"    {nome:<14}{etapa['segundos']:>8.1f}s  ({etapa['chamadas']}×)")
     print(f"  GitHub     : https://github.com/mazoir/dados_publicos")
     print("=" * 70 + "\n")
 
 
+def _gravar_relatorio(medicoes: Medicoes, status: str, parametros: dict, **extras) -> dict:
+    """Grava RELATORIO_FILE com as medições da execução (falhas só avisam)."""
+    try:
+        return medicoes.gravar(RELATORIO_FILE, pipeline="estban", status=status, parametros=parametros, **extras)
+    except OSError as e:
+        print(f"  [AVISO] Falha ao gravar relatório de execução: {e}")
+        return {"duracao_s": 0.0, "resumo": medicoes.resumo()}
+
+
 # ==============================================================================
 # README
 # ==============================================================================
@@ -800,6 +1828,7 @@ Repositório de dados públicos consolidados do Banco Central do Brasil, prontos
 * **Período:** 01/2020 a 12/2025 (72 meses)
 * **Separador:** `;`
 * **Encoding:** `UTF-8`
+* **Parquet:** `dados/bcb/cooperados/cooperados_por_cooperativa.parquet` (tipado)
 
 **Colunas:**
 
@@ -826,6 +1855,7 @@ Repositório de dados públicos consolidados do Banco Central do Brasil, prontos
 * **Separador:** `;`
 * **Encoding:** `UTF-8`
 * **Tamanho:** ~{tamanho_mb:.0f} MB
+* **Parquet:** `dados/bcb/estban/{OUTPUT_PARQUET.name}` (tipado, para Power BI e Python)
 
 **Colunas de Identificação:**
 
@@ -952,12 +1982,35 @@ in
 ```bash
 pip install requests pandas
 python pipeline_cooperados.py
+
+# Opções: downloads simultâneos e requisições por segundo ao BCB
+python pipeline_cooperados.py --workers 8 --taxa 4
+
+# Os ZIPs ficam em cache (_cache/, até --cache-mb) entre execuções;
+# para baixar tudo de novo:
+python pipeline_cooperados.py --clean-cache
+
+# Meses mais recentes revalidados no BCB a cada execução (padrão: 6;
+# os anteriores já em cache são usados sem requisição)
+python pipeline_cooperados.py --revalidar-meses 12
+
+# Só os meses novos ou cujo ZIP mudou (mantém os demais do consolidado)
+python pipeline_cooperados.py --incremental
+
+# Lê os CSVs em paralelo na consolidação (processos)
+python pipeline_cooperados.py --jobs 4
+
+# Sem commit/push (só gera os arquivos)
+python pipeline_cooperados.py --no-push
+
+# Métricas por período (cooperados_metricas.json / .prom); .prom para o node_exporter
+python pipeline_cooperados.py --metricas-prom /var/lib/node_exporter/cooperados.prom
 ```
 
 ### ESTBAN Municipal
 
 ```bash
-pip install requests pandas tqdm
+pip install requests pandas tqdm pyarrow
 python pipeline_estban.py
 ```
 
@@ -968,6 +2021,25 @@ python pipeline_estban.py --no-push
 
 # Período customizado
 python pipeline_estban.py --inicio 2024-01 --fim 2025-09
+
+# Downloads simultâneos (padrão: 4)
+python pipeline_estban.py --workers 8
+
+# Ignorar o cache local de arquivos brutos (dados/bcb/estban/_cache/)
+python pipeline_estban.py --no-cache
+
+# Atualização mensal: processa só meses novos ou alterados
+python pipeline_estban.py --incremental
+
+# Extração/transformação em 4 processos (CPU)
+python pipeline_estban.py --jobs 4
+
+# Saída particionada por mês: dados/bcb/estban/particionado/periodo=YYYYMM/part.parquet
+# (o manifesto.json lista registros, tamanho e SHA-256 de cada mês)
+python pipeline_estban.py --incremental --particionado
+
+# Carga histórica longa com memória constante (grava mês a mês)
+python pipeline_estban.py --inicio 1988-07 --fim 2025-09 --streaming
 ```
 
 ## Última atualização
@@ -1069,6 +2141,14 @@ Exemplos:
   python pipeline_estban.py --no-push
   python pipeline_estban.py --inicio 2024-01 --fim 2025-09
   python pipeline_estban.py --inicio 2023-01 --fim 2025-09 --no-push
+  python pipeline_estban.py --workers 8
+  python pipeline_estban.py --no-cache
+  python pipeline_estban.py --incremental
+  python pipeline_estban.py --jobs 4
+  python pipeline_estban.py --incremental --particionado
+  python pipeline_estban.py --gzip-nivel 9 --gzip-threads 4
+  python pipeline_estban.py --inicio 1988-07 --fim 2025-09 --streaming
+  python pipeline_estban.py --kpi-float32
         """,
     )
     parser.add_argument(
@@ -1088,6 +2168,58 @@ Exemplos:
         action="store_true",
         help="Não fazer git push automático",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DOWNLOAD_WORKERS_DEFAULT,
+        help=f"Downloads simultâneos (padrão: {DOWNLOAD_WORKERS_DEFAULT})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Não usar o cache local de arquivos brutos (baixa tudo novamente)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Processa só meses novos ou alterados e mescla na saída publicada",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Processos para extração/transformação dos meses (padrão: 1)",
+    )
+    parser.add_argument(
+        "--particionado",
+        action="store_true",
+        help="Gera também a saída particionada por mês (particionado/periodo=YYYYMM/)",
+    )
+    parser.add_argument(
+        "--gzip-nivel",
+        type=int,
+        default=GZIP_NIVEL_DEFAULT,
+        choices=range(1, 10),
+        metavar="1-9",
+        help=f"Nível de compressão do .csv.gz (padrão: {GZIP_NIVEL_DEFAULT})",
+    )
+    parser.add_argument(
+        "--gzip-threads",
+        type=int,
+        default=None,
+        help="Threads de compressão do .csv.gz (padrão: número de CPUs)",
+    )
+    parser.add_argument(
+        "--kpi-float32",
+        action="store_true",
+        help="Mantém os KPIs (%%) em float32 na memória (metade do espaço; "
+             "KPIs acima de ~100 mil podem variar na 2ª casa decimal)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Grava cada mês assim que processado (memória constante em cargas longas)",
+    )
 
     args = parser.parse_args()
 
@@ -1099,11 +2231,32 @@ Exemplos:
     if not padrao.match(args.fim):
         print(f"[ERRO] Formato inválido para --fim: {args.fim} (use YYYY-MM)")
         sys.exit(1)
+    if args.workers < 1:
+        print(f"[ERRO] --workers deve ser >= 1: {args.workers}")
+        sys.exit(1)
+    if args.jobs < 1:
+        print(f"[ERRO] --jobs deve ser >= 1: {args.jobs}")
+        sys.exit(1)
+    if args.gzip_threads is not None and args.gzip_threads < 1:
+        print(f"[ERRO] --gzip-threads deve ser >= 1: {args.gzip_threads}")
+        sys.exit(1)
+    if args.streaming and args.incremental:
+        print("[ERRO] --streaming e --incremental não podem ser usados juntos")
+        sys.exit(1)
 
     executar_pipeline(
         inicio=args.inicio,
         fim=args.fim,
         fazer_push=not args.no_push,
+        workers=args.workers,
+        usar_cache=not args.no_cache,
+        incremental=args.incremental,
+        jobs=args.jobs,
+        particionado=args.particionado,
+        gzip_nivel=args.gzip_nivel,
+        gzip_threads=args.gzip_threads,
+        streaming=args.streaming,
+        kpi_float32=args.kpi_float32,
     )
 
 